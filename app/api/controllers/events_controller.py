@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import (APIRouter, Depends, WebSocket, WebSocketDisconnect,
+                     status)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import SessionLocal, get_db
 from app.api.dependencies.enums import EventPages
-from app.api.schemas.event import CreateEvent, EditEvent, Event
+from app.api.dependencies.exceptions import EventNotFound
+from app.api.schemas.event import (CreateEvent, EditEvent, EditEventScore,
+                                   Event, EventScore)
 from app.api.schemas.user import User
 from app.api.services import events_service
 from app.api.services.auth_service import get_current_user
@@ -48,10 +52,66 @@ async def edit_event(event: EditEvent,
     )
     
 
+@app.patch("/{event_id}/score", response_model=EventScore)
+async def edit_event_score(event_id: int, score: EditEventScore,
+                           current_user: User = Depends(get_current_user),
+                           db: AsyncSession = Depends(get_db)):
+    # Returns 409 if the score was changed since score.version
+    return await events_service.edit_event_score(
+        db, event_id=event_id, score=score, current_user=current_user
+    )
+    
+
 @app.delete("/{event_id}", response_model=Event)
 async def delete_event(event_id: int, 
                        current_user: User = Depends(get_current_user),
                        db: AsyncSession = Depends(get_db)):
     return await events_service.delete_event(
         db, event_id=event_id, current_user=current_user
-    )
\ No newline at end of file
+    )
+
+
+@app.get("/{event_id}/live")
+async def get_event_live(event_id: int):
+    # Server-sent events: the current score, then every update.
+    # The session is only needed for the current state, a get_db session
+    # would stay checked out until the stream ends
+    async with SessionLocal() as db:
+        updates = await events_service.get_event_live_updates(
+            db, event_id=event_id
+        )
+    
+    async def stream():
+        async for message in updates:
+            yield f"data: {message}\n\n" if message else ": keepalive\n\n"
+    
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.websocket("/{event_id}/live/ws")
+async def get_event_live_ws(websocket: WebSocket, event_id: int):
+    # The session is only needed for the current state, 
+    # it isn't kept open for the whole connection
+    async with SessionLocal() as db:
+        try:
+            updates = await events_service.get_event_live_updates(
+                db, event_id=event_id
+            )
+        except EventNotFound:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    
+    await websocket.accept()
+    try:
+        async for message in updates:
+            if message is None:
+                await websocket.send_json({"type": "keepalive"})
+            else:
+                await websocket.send_text(message)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await updates.aclose()
@@ -1,8 +1,26 @@
 from fastapi import APIRouter
 
+from app.api.dependencies.live import live_broker
+from app.api.services import news_service
+
 app = APIRouter()
 
 
 @app.get("")
 async def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/cache")
+async def get_cache_stats():
+    # Hit ratios of the in-process caches, to size them
+    return {
+        "news": news_service.news_cache.stats(),
+        "search": news_service.search_cache.stats(),
+    }
+
+
+@app.get("/live")
+async def get_live_stats():
+    # Subscribers of live event updates of this worker
+    return live_broker.stats()
\ No newline at end of file
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+
+from app.api.schemas.home import Home
+from app.api.services import home_service
+
+app = APIRouter()
+
+
+@app.get("", response_model=Home)
+async def get_home():
+    # Latest news, main page events, the roster and new store items at once
+    home = await home_service.get_home()
+    return home
@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies.conditional import (is_not_modified, not_modified,
+                                              set_validators)
 from app.api.dependencies.database import get_db
-from app.api.schemas.news import CreateNews, News
+from app.api.dependencies.enums import ExportFormats
+from app.api.dependencies.exceptions import FeedUnavailable
+from app.api.dependencies.feeds import news_feeds, refresh_news_feeds
+from app.api.schemas.news import (CreateNews, News, NewsBatch, NewsFacets,
+                                  NewsImportReport, NewsPage, NewsPreview,
+                                  NewsSearchResult, NewsSuggestion,
+                                  PopularNews)
 from app.api.schemas.user import User
 from app.api.services import auth_service, news_service
 
@@ -16,7 +24,67 @@ async def get_news_categories(db: AsyncSession = Depends(get_db)):
     return categories
 
 
-@app.get("/deleted", response_model=list[News])
+@app.get("/facets", response_model=NewsFacets)
+async def get_news_facets(db: AsyncSession = Depends(get_db)):
+    facets = await news_service.get_news_facets(db)
+    return facets
+
+
+@app.get("/suggest", response_model=list[NewsSuggestion])
+async def suggest_news(q: str, limit: int = 5):
+    suggestions = news_service.suggest_news(q, limit=limit)
+    return suggestions
+
+
+@app.get("/popular", response_model=list[PopularNews])
+async def get_most_read_news(limit: int = 5, db: AsyncSession = Depends(get_db)):
+    # The most read news of the last week
+    news = await news_service.get_most_read_news(db, limit=limit)
+    return news
+
+
+@app.get("/batch", response_model=NewsBatch)
+async def get_news_batch(ids: str, db: AsyncSession = Depends(get_db)):
+    # ids is a comma separated list, e.g. ?ids=1,2,3
+    news = await news_service.get_news_batch(db, ids=ids)
+    return news
+
+
+@app.get("/export")
+async def export_news(format: ExportFormats = ExportFormats.NDJSON,
+                      current_user: User = Depends(auth_service.get_current_user)):
+    # News joined with their actions, streamed straight from the database
+    content = await news_service.export_news(
+        format=format, current_user=current_user
+    )
+    media_type = (
+        "text/csv" if format == ExportFormats.CSV else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        content, media_type=media_type,
+        headers={
+            "Content-Disposition": 
+                f"attachment; filename=news.{format.value}"
+        }
+    )
+
+
+@app.get("/feed.rss")
+async def get_news_rss(request: Request):
+    return await _get_feed_response(request, "rss")
+
+
+@app.get("/feed.atom")
+async def get_news_atom(request: Request):
+    return await _get_feed_response(request, "atom")
+
+
+@app.get("/feed.json")
+async def get_news_json_feed(request: Request):
+    return await _get_feed_response(request, "json")
+
+
+@app.get("/deleted", response_model=list[NewsPreview])
 async def get_all_deleted_news(limit: int = 16, offset: int = 0,
                                year: int | None = None,
                                month: int | None = None,
@@ -40,7 +108,7 @@ async def get_all_deleted_news(news_id: int,
     return news
 
 
-@app.get("/sheduled", response_model=list[News])
+@app.get("/sheduled", response_model=list[NewsPreview])
 async def get_all_scheduled_news(limit: int = 16, offset: int = 0, 
                                  year: int | None = None, 
                                  month: int | None = None, 
@@ -54,24 +122,53 @@ async def get_all_scheduled_news(limit: int = 16, offset: int = 0,
     return news
 
 
-@app.get("", response_model=list[News])
-async def get_all_news(limit: int = 16, offset: int = 0, 
+@app.get("", response_model=list[NewsSearchResult] | NewsPage)
+async def get_all_news(request: Request, response: Response,
+                       limit: int = 16, offset: int = 0, 
                        year: int | None = None, month: int | None = None, 
                        category: str | None = None, search: str | None = None,
+                       cursor: str | None = None,
                        db: AsyncSession = Depends(get_db)):
+    # Passing cursor (an empty one for the first page) switches the response
+    # to NewsPage with next_cursor, otherwise a plain offset list is returned.
+    # Search results are ranked by relevance and are always paged by offset
+    if not search:
+        etag, last_modified = await news_service.get_all_news_validators(
+            db, limit=limit, offset=offset, year=year, month=month, 
+            category=category, cursor=cursor
+        )
+        if is_not_modified(request, etag=etag, last_modified=last_modified):
+            return not_modified(etag=etag, last_modified=last_modified)
+        set_validators(response, etag=etag, last_modified=last_modified)
+    
     news = await news_service.get_all_news(
         db, limit=limit, offset=offset, year=year, month=month, 
-        category=category, search = search
+        category=category, search = search, cursor=cursor
     )
     return news
 
 
 @app.get("/{news_id}", response_model=News)
-async def get_news(news_id: int, db: AsyncSession = Depends(get_db)):
+async def get_news(news_id: int, request: Request, response: Response,
+                   db: AsyncSession = Depends(get_db)):
+    # The validators are built from updated_at only, 
+    # so a revalidation doesn't load the content
+    etag, last_modified = await news_service.get_news_validators(db, news_id)
+    news_service.count_news_view(news_id)
+    if is_not_modified(request, etag=etag, last_modified=last_modified):
+        return not_modified(etag=etag, last_modified=last_modified)
+    set_validators(response, etag=etag, last_modified=last_modified)
+    
     news = await news_service.get_news(db, news_id)
     return news
 
 
+@app.get("/{news_id}/related", response_model=list[NewsPreview])
+async def get_related_news(news_id: int, db: AsyncSession = Depends(get_db)):
+    news = await news_service.get_related_news(db, news_id)
+    return news
+
+
 @app.delete("/{news_id}")
 async def delete_news(news_id: int, 
                       current_user: User = Depends(auth_service.get_current_user), 
@@ -96,4 +193,50 @@ async def create_news(news: CreateNews,
                       current_user: User = Depends(auth_service.get_current_user), 
                       db: AsyncSession = Depends(get_db)):
     news = await news_service.create_news(db, news, current_user=current_user)
-    return news
\ No newline at end of file
+    return news
+
+
+@app.post("/import", response_model=NewsImportReport)
+async def import_news(request: Request,
+                      current_user: User = Depends(auth_service.get_current_user), 
+                      db: AsyncSession = Depends(get_db)):
+    # The body is NDJSON, one CreateNews object per line, 
+    # it is read as a stream and imported in batches
+    report = await news_service.import_news(
+        db, lines=request.stream(), current_user=current_user
+    )
+    return report
+
+
+# Seconds aggregators may keep a feed without revalidating it
+FEED_MAX_AGE = 30
+
+
+async def _get_feed_response(request: Request, format: str) -> Response:
+    # Feeds are rendered on writes, polling them only sends ready bytes
+    feed = news_feeds.get(format)
+    if feed is None:
+        await refresh_news_feeds()
+        feed = news_feeds.get(format)
+        if feed is None:
+            raise FeedUnavailable
+    
+    headers = {
+        "Cache-Control": f"public, max-age={FEED_MAX_AGE}",
+        "Vary": "Accept-Encoding",
+    }
+    use_gzip = "gzip" in request.headers.get("accept-encoding", "")
+    etag = feed.gzip_etag if use_gzip else feed.etag
+    if is_not_modified(request, etag=etag, last_modified=feed.last_modified):
+        response = not_modified(etag=etag, last_modified=feed.last_modified)
+        response.headers.update(headers)
+        return response
+    
+    body = feed.body
+    if use_gzip:
+        body = feed.gzip_body
+        headers["Content-Encoding"] = "gzip"
+    
+    response = Response(body, media_type=feed.media_type, headers=headers)
+    set_validators(response, etag=etag, last_modified=feed.last_modified)
+    return response
\ No newline at end of file
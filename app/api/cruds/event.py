@@ -1,10 +1,58 @@
 from datetime import datetime
 
 from loguru import logger
-from sqlalchemy import and_, extract, or_, select
+from sqlalchemy import (Select, extract, func, literal, or_, select, true,
+                        union_all, update)
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.exc import StaleDataError
 
-from app.api.models import Event
+from app.api.dependencies.cache import events_version
+from app.api.dependencies.dates import get_period_bounds
+from app.api.dependencies.live import get_score_message, live_broker
+from app.api.models import Event, Location, Team
+
+# Main page events are in one of these groups
+CURRENT_EVENTS = 0
+FUTURE_EVENTS = 1
+FINISHED_EVENTS = 2
+
+FirstTeam = aliased(Team, name="first_team")
+SecondTeam = aliased(Team, name="second_team")
+
+
+def select_event_rows(*columns) -> Select:
+    """Selects events as flat rows with their teams and locations joined in.
+    
+    The rows are serialized by events_service.serialize_event_rows, 
+    without loading ORM objects.
+    
+    Args:
+        *columns: Extra columns to select.
+    
+    Returns:
+        Select: The query, to be filtered and ordered by the caller.
+    """
+    return (
+        select(
+            Event.id, Event.league, Event.tour, Event.start_date, 
+            Event.end_date, Event.stream_url, Event.version,
+            Event.first_team_score, Event.second_team_score,
+            FirstTeam.id.label("first_team_id"), 
+            FirstTeam.name.label("first_team_name"),
+            FirstTeam.logo_url.label("first_team_logo_url"),
+            SecondTeam.id.label("second_team_id"), 
+            SecondTeam.name.label("second_team_name"),
+            SecondTeam.logo_url.label("second_team_logo_url"),
+            Location.name.label("location_name"), 
+            Location.address.label("location_address"),
+            *columns
+        )
+        .join(FirstTeam, FirstTeam.id == Event.first_team_id)
+        .join(SecondTeam, SecondTeam.id == Event.second_team_id)
+        .outerjoin(Location, Location.id == Event.location_id)
+    )
 
 
 @logger.catch
@@ -45,6 +93,7 @@ async def create_event(db: AsyncSession, league: str, tour: str | None,
     
     db.add(event)
     await db.commit()
+    events_version.bump()
     await db.refresh(event)
     
     return event
@@ -53,7 +102,7 @@ async def create_event(db: AsyncSession, league: str, tour: str | None,
 @logger.catch
 async def get_all_events(db: AsyncSession, limit: int, 
                          offset: int, opponent_id: int | None,
-                         year: int | None, month: int | None) -> list[Event]:
+                         year: int | None, month: int | None) -> list[Row]:
     """
     Gets all events from the database, filtered by given year and month if provided.
 
@@ -66,16 +115,16 @@ async def get_all_events(db: AsyncSession, limit: int,
         month (int | None): The month to filter by, if provided.
 
     Returns:
-        list[Event]: The list of events.
+        list[Row]: The events as rows of select_event_rows.
     """
-                  
     query = (
-        select(Event).order_by(Event.start_date).offset(offset).limit(limit)
+        select_event_rows()
+        .order_by(Event.start_date).offset(offset).limit(limit)
     )
     
-    print(year)
-    
     if opponent_id:
+        # Each side is an indexed lookup, Postgres combines them 
+        # with a BitmapOr
         query = query.where(
             or_(
                 Event.first_team_id == opponent_id,
@@ -83,94 +132,103 @@ async def get_all_events(db: AsyncSession, limit: int,
             )
         )
     if year:
-        query = query.where(
-            extract("year", Event.start_date) == year
-        )
-    if month:
+        try:
+            start, end = get_period_bounds(year, month or None)
+        except ValueError:
+            # Nonexistent year or month, nothing can match
+            return []
+        # A half-open range on start_date, so it can use its index
+        query = query.where(Event.start_date >= start, Event.start_date < end)
+    elif month:
+        # Without a year the month is not a single range
         query = query.where(
             extract("month", Event.start_date) == month
         )
         
     results = await db.execute(query)
     
-    return results.scalars().all()
+    return results.all()
 
 
 @logger.catch
-async def get_current_event(db: AsyncSession) -> Event | None:
-    """Gets the current event from the database.
+async def get_main_page_events(db: AsyncSession, now: datetime, 
+                               size: int) -> tuple[list[Row], datetime | None]:
+    """Gets the candidates for the main page events in one statement.
     
-    The current event is the event that does not have an end date and its start date
-    is less than or equal to the current datetime.
+    The current event, the nearest future events and the latest finished 
+    events are selected by a UNION of three limited queries, teams and
+    locations are joined in by select_event_rows. The next start or end 
+    date is looked up on the date indexes in the same statement.
     
     Args:
         db (AsyncSession): SQLAlchemy AsyncSession object.
+        now (datetime): The current datetime.
+        size (int): Number of events shown on the main page.
     
     Returns:
-        Event | None: The current event or None if no current event
+        tuple[list[Row], datetime | None]: The events as rows of 
+            select_event_rows with their group (CURRENT_EVENTS, FUTURE_EVENTS
+            or FINISHED_EVENTS) in the order of the page, and the nearest 
+            start or end date after now, when the selection changes.
     """
-    results = await db.execute(
-        select(Event).where(
-            and_(
-                Event.end_date == None,
-                Event.start_date <= datetime.now()
-            )
+    current = (
+        select(
+            Event.id, literal(CURRENT_EVENTS).label("group"), 
+            func.row_number().over(order_by=Event.start_date).label("position")
         )
+        .where(Event.end_date == None, Event.start_date <= now)
+        .order_by(Event.start_date)
+        .limit(1)
     )
-    return results.scalars().first()
-
-
-@logger.catch
-async def get_finished_events(db: AsyncSession, limit: int, 
-                              offset: int) -> list[Event]:
-    """Gets finished events from the database.
-    
-    Finished events are events that have an end date and that date is less than or
-    equal to the current datetime.
-    
-    Args:
-        db (AsyncSession): SQLAlchemy AsyncSession object.
-        limit (int): Number of events to return.
-        offset (int): Offset to start returning events from.
-    
-    Returns:
-        list[Event]: List of finished events.
-    """
-    results = await db.execute(
-        select(Event).where(
-            and_(
-                Event.end_date != None,
-                Event.end_date <= datetime.now()
-            )
-        ).order_by(Event.start_date.desc()).offset(offset).limit(limit)
+    future = (
+        select(
+            Event.id, literal(FUTURE_EVENTS), 
+            func.row_number().over(order_by=Event.start_date)
+        )
+        .where(Event.start_date > now)
+        .order_by(Event.start_date)
+        .limit(size)
     )
-    return results.scalars().all()
-
-
-@logger.catch
-async def get_future_events(db: AsyncSession, limit: int, 
-                            offset: int) -> list[Event]:
-    """Gets future events from the database.
-    
-    Future events are events that have a start date that is greater than the current
-    datetime.
+    finished = (
+        select(
+            Event.id, literal(FINISHED_EVENTS), 
+            func.row_number().over(order_by=Event.start_date.desc())
+        )
+        .where(Event.end_date != None, Event.end_date <= now)
+        .order_by(Event.start_date.desc())
+        .limit(size)
+    )
+    window = union_all(current, future, finished).subquery()
     
-    Args:
-        db (AsyncSession): SQLAlchemy AsyncSession object.
-        limit (int): Number of events to return.
-        offset (int): Offset to start returning events from.
+    next_boundary = func.least(
+        select(func.min(Event.start_date))
+        .where(Event.start_date > now)
+        .scalar_subquery(),
+        select(func.min(Event.end_date))
+        .where(Event.end_date > now)
+        .scalar_subquery()
+    )
     
-    Returns:
-        list[Event]: List of future events.
-    """
+    events = (
+        select_event_rows(window.c.group, window.c.position)
+        .join(window, window.c.id == Event.id)
+        .subquery()
+    )
+    # The one-row boundary is outer joined with the events, so it is read
+    # even without selected events, e.g. while the only event is in 
+    # progress with an end date
+    boundary = select(next_boundary.label("next_boundary")).subquery()
     results = await db.execute(
-        select(Event).where(
-            and_(
-                Event.start_date > datetime.now()
-            )
-        ).order_by(Event.start_date.asc()).offset(offset).limit(limit)
+        select(events, boundary.c.next_boundary)
+        .select_from(boundary)
+        .outerjoin(events, true())
+        .order_by(events.c.group, events.c.position)
+    )
+    rows = results.all()
+    return (
+        [row for row in rows if row.id is not None], 
+        rows[0].next_boundary
     )
-    return results.scalars().all()
 
 
 @logger.catch
@@ -190,11 +248,12 @@ async def get_event_by_id(db: AsyncSession, event_id: int) -> Event | None:
     return results.scalars().first()
 
 
-@logger.catch
+@logger.catch(exclude=StaleDataError)
 async def edit_event(db: AsyncSession, event: Event, league: str, tour: str,
-                     start_date: datetime, end_date: datetime, 
+                     start_date: datetime, end_date: datetime | None, 
                      location_id: int, first_team_id: int, second_team_id: int,
-                     first_team_score: int, second_team_score: int) -> Event:
+                     first_team_score: int, second_team_score: int,
+                     stream_url: str | None) -> Event:
     """Edits an event in the database.
     
     Args:
@@ -203,37 +262,100 @@ async def edit_event(db: AsyncSession, event: Event, league: str, tour: str,
         league (str): League name.
         tour (str): Tour name.
         start_date (datetime): Event start date.
-        end_date (datetime): Event end date.
+        end_date (datetime | None): Event end date.
         location_id (int): Event location id.
         first_team_id (int): First team id.
         second_team_id (int): Second team id.
         first_team_score (int): First team score.
         second_team_score (int): Second team score.
+        stream_url (str | None): Event stream url.
     
     Returns:
         Event: Edited event object.
+    
+    Raises:
+        StaleDataError: The event was changed since it was loaded.
     """
     event.league = league
     event.tour = tour
     event.start_date = start_date.replace(tzinfo=None)
-    event.end_date = end_date.replace(tzinfo=None)
+    event.end_date = end_date.replace(tzinfo=None) if end_date else None
     event.location_id = location_id
     event.first_team_id = first_team_id
     event.second_team_id = second_team_id
     event.first_team_score = first_team_score
     event.second_team_score = second_team_score
-    await db.commit()
+    event.stream_url = stream_url
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise
+    events_version.bump()
     await db.refresh(event)
+    await live_broker.publish(event.id, get_score_message(event))
     return event
 
 
-@logger.catch
+async def edit_event_score(db: AsyncSession, event_id: int, version: int,
+                           first_team_score: int, 
+                           second_team_score: int) -> Row | None:
+    """Sets the score of an event if it was not changed since the given version.
+    
+    A single conditional UPDATE ... RETURNING, the event is not loaded.
+    
+    Args:
+        db (AsyncSession): SQLAlchemy AsyncSession object.
+        event_id (int): ID of the event.
+        version (int): The version the score was changed from.
+        first_team_score (int): First team score.
+        second_team_score (int): Second team score.
+    
+    Returns:
+        Row | None: The id, scores, dates and the new version of the event, 
+            None if there is no event with this id and version.
+    
+    Not wrapped in logger.catch, a failed statement is raised to the caller 
+    instead of being taken for a version conflict.
+    """
+    results = await db.execute(
+        update(Event)
+        .where(Event.id == event_id, Event.version == version)
+        .values(
+            first_team_score=first_team_score, 
+            second_team_score=second_team_score,
+            version=Event.version + 1
+        )
+        .returning(
+            Event.id, Event.first_team_score, Event.second_team_score,
+            Event.start_date, Event.end_date, Event.version
+        )
+        .execution_options(synchronize_session=False)
+    )
+    event = results.first()
+    await db.commit()
+    
+    if event is not None:
+        events_version.bump()
+        await live_broker.publish(event.id, get_score_message(event))
+    return event
+
+
+@logger.catch(exclude=StaleDataError)
 async def delete_event(db: AsyncSession, event: Event):
     """Deletes an event from the database.
     
     Args:
         db (AsyncSession): SQLAlchemy AsyncSession object.
         event (Event): Event object to delete.
+    
+    Raises:
+        StaleDataError: The event was changed since it was loaded.
     """
     await db.delete(event)
-    await db.commit()
\ No newline at end of file
+    try:
+        await db.commit()
+    except StaleDataError:
+        await db.rollback()
+        raise
+    events_version.bump()
\ No newline at end of file
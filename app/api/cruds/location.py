@@ -2,6 +2,7 @@ from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies.cache import events_version
 from app.api.models import Location
 from app.config import team_member_settings
 
@@ -88,6 +89,8 @@ async def edit_location(db: AsyncSession, location: Location, name: str,
     location.name = name
     location.address = address
     await db.commit()
+    # Cached events show the names and addresses of their locations
+    events_version.bump()
     await db.refresh(location)
     
     return location
\ No newline at end of file
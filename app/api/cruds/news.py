@@ -1,12 +1,80 @@
-from datetime import datetime, timedelta
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator
 
 from loguru import logger
-from sqlalchemy import and_, delete, extract, func, or_, select
+from sqlalchemy import (Integer, Select, and_, case, column, delete, extract,
+                        false, func, insert, literal, or_, select, union,
+                        update, values)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, defer
 
-from app.api.models import News, NewsAction, NewsCategory
+from app.api.dependencies.cache import news_version
+from app.api.dependencies.dates import get_period_bounds
+from app.api.dependencies.text import get_reading_time, make_excerpt
+from app.api.models import (News, NewsAction, NewsCategory, NewsRelated,
+                            NewsViews)
 from app.config import db_constants
 
+# Text search configuration of News.search_vector
+SEARCH_CONFIG = "russian"
+SNIPPET_OPTIONS = "StartSel=<b>, StopSel=</b>, MaxFragments=2, MaxWords=30, MinWords=10"
+
+# Maximum number of news deleted in one transaction by delete_expired_news
+PURGE_CHUNK_SIZE = 500
+# Number of rows fetched from the server-side cursor at once by exports
+EXPORT_CHUNK_SIZE = 1000
+
+# Number of precomputed related news of an item
+RELATED_NEWS_SIZE = 6
+# Bonus to the similarity score of related news of the same category
+RELATED_CATEGORY_WEIGHT = 0.3
+# Number of the latest news of the same category scored as related news
+# besides the title matches, keeps the scoring bound in large categories
+RELATED_CATEGORY_CANDIDATES = 50
+
+# News lists show excerpts, so they never load the content
+WITHOUT_CONTENT = defer(News.content, raiseload=True)
+
+
+def _get_publication_status(news_date: datetime) -> str:
+    if news_date > datetime.now():
+        return db_constants.NEWS_SCHEDULED
+    return db_constants.NEWS_AVAILABLE
+
+
+def _filter_by_period(query: Select, year: int | None, 
+                     month: int | None) -> Select:
+    """
+    Filter a news query by year and month of news_date.
+
+    The filter is a half-open range on news_date, so it can use the 
+    (status, news_date, id) index.
+
+    Args:
+        query (Select): The query to filter.
+        year (int | None): The year to filter by, if provided.
+        month (int | None): The month to filter by, if provided.
+
+    Returns:
+        Select: The filtered query.
+    """
+    if year is not None:
+        try:
+            start, end = get_period_bounds(year, month)
+        except ValueError:
+            # Nonexistent year or month, nothing can match
+            return query.where(false())
+        return query.where(News.news_date >= start, News.news_date < end)
+    
+    if month is not None:
+        # Without a year the month is not a single range, 
+        # so it can't be rewritten as one
+        query = query.where(extract("month", News.news_date) == month)
+    
+    return query
+
 
 @logger.catch
 async def get_news_by_id(db: AsyncSession, news_id: int) -> News | None:
@@ -24,10 +92,124 @@ async def get_news_by_id(db: AsyncSession, news_id: int) -> News | None:
     return results.scalars().first()
 
 
+@logger.catch
+async def get_news_updated_at(db: AsyncSession, 
+                              news_id: int) -> tuple[str, datetime] | None:
+    """
+    Get the status and the modification date of a news item 
+    without loading the item itself.
+
+    Args:
+        db (AsyncSession): The database session.
+        news_id (int): The ID of the news item.
+
+    Returns:
+        tuple[str, datetime] | None: The status and updated_at if found,
+            otherwise None.
+    """
+    results = await db.execute(
+        select(News.status, News.updated_at).where(News.id == news_id)
+    )
+    return results.tuples().first()
+
+
+@logger.catch
+async def get_all_news_updated_at(db: AsyncSession, year: int | None, 
+                                  month: int | None, 
+                                  category: str | None) -> tuple[datetime | None, int]:
+    """
+    Get the latest modification date and the number of available news 
+    matching the news feed filters.
+
+    Args:
+        db (AsyncSession): The database session.
+        year (int | None): The year to filter by, if provided.
+        month (int | None): The month to filter by, if provided.
+        category (str | None): The category to filter by, if provided.
+
+    Returns:
+        tuple[datetime | None, int]: The max updated_at (None if nothing
+            matches) and the count of matching news.
+    """
+    query = (
+        select(func.max(News.updated_at), func.count())
+        .where(News.status == db_constants.NEWS_AVAILABLE)
+    )
+    query = _filter_by_period(query, year=year, month=month)
+    if category is not None:
+        query = query.where(News.category_name == category)
+    
+    results = await db.execute(query)
+    return results.tuples().one()
+
+
+@logger.catch
+async def get_news_by_ids(db: AsyncSession, news_ids: list[int],
+                          load_content: bool = True) -> list[News]:
+    """
+    Get news items from the database by their IDs, in the order of the IDs.
+
+    Args:
+        db (AsyncSession): The database session.
+        news_ids (list[int]): The IDs of the news items to get.
+        load_content (bool): Whether to load the content of the news items.
+
+    Returns:
+        list[News]: The found news items, missing IDs are skipped.
+    """
+    query = select(News).where(News.id.in_(news_ids))
+    if not load_content:
+        query = query.options(WITHOUT_CONTENT)
+    
+    results = await db.execute(query)
+    news = {news_.id: news_ for news_ in results.scalars().all()}
+    return [news[news_id] for news_id in news_ids if news_id in news]
+
+
+@logger.catch
+async def get_news_for_index(db: AsyncSession) -> list[tuple]:
+    """
+    Get the fields of all available news needed by the search index.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        list[tuple]: Rows of (id, title, content, news_date, category_name).
+    """
+    results = await db.execute(
+        select(
+            News.id, News.title, News.content, News.news_date, 
+            News.category_name
+        )
+        .where(News.status == db_constants.NEWS_AVAILABLE)
+    )
+    return results.tuples().all()
+
+
+@logger.catch
+async def get_news_titles(db: AsyncSession) -> list[tuple]:
+    """
+    Get the titles of all available news for the title suggestions.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        list[tuple]: Rows of (id, title, news_date).
+    """
+    results = await db.execute(
+        select(News.id, News.title, News.news_date)
+        .where(News.status == db_constants.NEWS_AVAILABLE)
+    )
+    return results.tuples().all()
+
+
 @logger.catch
 async def get_all_news(db: AsyncSession, limit: int, offset: int, 
                        year: int | None, month: int | None,
-                       category: str | None, search: str | None) -> list[News]:
+                       category: str | None,
+                       cursor: tuple[datetime, int] | None = None) -> list[News]:
     """
     Get all available news from the database, 
     filtered by given year and month if provided.
@@ -38,53 +220,106 @@ async def get_all_news(db: AsyncSession, limit: int, offset: int,
         offset (int): The offset from the start of the result set.
         year (int | None): The year to filter by, if provided.
         month (int | None): The month to filter by, if provided.
+        cursor (tuple[datetime, int] | None): The (news_date, id) of the last
+            news item of the previous page. If provided, the page starts right
+            after it and the offset is ignored.
 
     Returns:
         list[News]: The list of news.
     """
     query = (
         select(News)
+        .options(WITHOUT_CONTENT)
         .where(
-            and_(
-                # Only include news items that have a date in the past
-                News.news_date <= datetime.now(), 
-                # Only include news items that are available
-                News.status == db_constants.NEWS_AVAILABLE
-            )
+            # Only include published news items,
+            # scheduled ones get this status at their news_date
+            News.status == db_constants.NEWS_AVAILABLE
         )
         # Order by news_date in descending order and id in ascending order
         .order_by(News.news_date.desc(), News.id.asc())
-        # Skip the first offset items
-        .offset(offset)
         # Limit the result set to limit
         .limit(limit)
     )
 
-    if year is not None:
-        # Filter by year if provided
-        query = query.where(extract("year", News.news_date) == year)
-    if month is not None:
-        # Filter by month if provided
-        query = query.where(extract("month", News.news_date) == month)
-    if category is not None:
-        # Filter by category if provided
-        query = query.where(News.category_name == category)
-    if search is not None:
+    if cursor is not None:
+        # Seek right after the last news item of the previous page
+        # using the same ordering as above
+        cursor_date, cursor_id = cursor
         query = query.where(
             or_(
-                News.title.icontains(search),
-                News.content.icontains(search),
-                func.to_tsvector(
-                    func.coalesce(News.title, '') + ' ' +
-                    func.coalesce(News.content, ''))
-                .op('@@')(func.to_tsquery(' & '.join(search.split())))
+                News.news_date < cursor_date,
+                and_(News.news_date == cursor_date, News.id > cursor_id)
             )
         )
+    else:
+        # Skip the first offset items
+        query = query.offset(offset)
+
+    # Filter by year and month if provided
+    query = _filter_by_period(query, year=year, month=month)
+    if category is not None:
+        # Filter by category if provided
+        query = query.where(News.category_name == category)
 
     results = await db.execute(query)
     return results.scalars().all()
 
 
+@logger.catch
+async def search_news(db: AsyncSession, search: str, limit: int, offset: int,
+                      year: int | None, month: int | None,
+                      category: str | None) -> list[tuple[News, str]]:
+    """
+    Full-text search over available news, ranked by relevance.
+
+    The search uses the stored search_vector column (title weighted above 
+    content) and its GIN index. The query is parsed by websearch_to_tsquery,
+    so any user input is a valid query.
+
+    Args:
+        db (AsyncSession): The database session.
+        search (str): The search query as typed by the user.
+        limit (int): The number of news to return.
+        offset (int): The offset from the start of the result set.
+        year (int | None): The year to filter by, if provided.
+        month (int | None): The month to filter by, if provided.
+        category (str | None): The category to filter by, if provided.
+
+    Returns:
+        list[tuple[News, str]]: The found news with highlighted snippets
+            of their content.
+    """
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+    rank = func.ts_rank_cd(News.search_vector, ts_query)
+    snippet = func.ts_headline(
+        SEARCH_CONFIG, News.content, ts_query, SNIPPET_OPTIONS
+    )
+    
+    query = (
+        select(News, snippet)
+        .options(WITHOUT_CONTENT)
+        .where(
+            and_(
+                News.status == db_constants.NEWS_AVAILABLE,
+                News.search_vector.op('@@')(ts_query)
+            )
+        )
+        # Most relevant first, the newest of equally relevant
+        .order_by(rank.desc(), News.news_date.desc(), News.id.asc())
+        .offset(offset)
+        .limit(limit)
+    )
+    
+    # Filter by year and month if provided
+    query = _filter_by_period(query, year=year, month=month)
+    if category is not None:
+        # Filter by category if provided
+        query = query.where(News.category_name == category)
+    
+    results = await db.execute(query)
+    return results.tuples().all()
+
+
 @logger.catch
 async def get_all_deleted_news(db: AsyncSession, limit: int, offset: int, 
                                year: int | None = None, 
@@ -106,6 +341,7 @@ async def get_all_deleted_news(db: AsyncSession, limit: int, offset: int,
     """
     query = (
         select(News)
+        .options(WITHOUT_CONTENT)
         .where(
             # Only include news items that are no longer available
             News.status == db_constants.NEWS_UNAVAILABLE
@@ -114,12 +350,8 @@ async def get_all_deleted_news(db: AsyncSession, limit: int, offset: int,
         .offset(offset)
         .limit(limit)
     )
-    if year is not None:
-        # Filter by year if provided
-        query = query.where(extract("year", News.news_date) == year)
-    if month is not None:
-        # Filter by month if provided
-        query = query.where(extract("month", News.news_date) == month)
+    # Filter by year and month if provided
+    query = _filter_by_period(query, year=year, month=month)
     if category is not None:
         # Filter by category if provided
         query = query.where(News.category_name == category)
@@ -128,6 +360,28 @@ async def get_all_deleted_news(db: AsyncSession, limit: int, offset: int,
     return results.scalars().all()
 
 
+@logger.catch
+async def get_news_facets(db: AsyncSession) -> list[tuple[int, int, str, int]]:
+    """
+    Count published news by year, month and category in one query.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        list[tuple[int, int, str, int]]: Rows of 
+            (year, month, category_name, count).
+    """
+    year = extract("year", News.news_date).label("year")
+    month = extract("month", News.news_date).label("month")
+    results = await db.execute(
+        select(year, month, News.category_name, func.count())
+        .where(News.status == db_constants.NEWS_AVAILABLE)
+        .group_by(year, month, News.category_name)
+    )
+    return results.tuples().all()
+
+
 @logger.catch
 async def get_news_category(db: AsyncSession, name: str) -> NewsCategory | None:
     """
@@ -148,7 +402,10 @@ async def get_news_category(db: AsyncSession, name: str) -> NewsCategory | None:
 async def add_news_action(db: AsyncSession, user_id: int, news_id: int, 
                           action_type: str) -> NewsAction:
     """
-    Add a new news action to the database.
+    Add a new news action to the session.
+    
+    The action is not committed, it is written in the same transaction 
+    as the news change it records.
 
     Args:
         db (AsyncSession): The database session.
@@ -163,8 +420,6 @@ async def add_news_action(db: AsyncSession, user_id: int, news_id: int,
         user_id=user_id, news_id=news_id, type=action_type
     )
     db.add(news_action)
-    await db.commit()
-    await db.refresh(news_action)
     return news_action
 
 
@@ -187,33 +442,93 @@ async def add_news(db: AsyncSession, user_id: int, title: str,
     Returns:
         News: The newly created news item.
     """
+    news_date = news_date.replace(tzinfo=None)
     news = News(
-        title=title, news_date=news_date.replace(tzinfo=None), content=content,
-        category_name=category_name, image_url=image_url
+        title=title, news_date=news_date, content=content,
+        category_name=category_name, image_url=image_url,
+        excerpt=make_excerpt(content), reading_time=get_reading_time(content),
+        status=_get_publication_status(news_date)
     )
 
     db.add(news)
-    await db.commit()
-    await db.refresh(news)
+    # INSERT ... RETURNING gives the id and the server defaults,
+    # the action is committed together with the news
+    await db.flush()
     
     await add_news_action(
         db, user_id=user_id, news_id=news.id, action_type="create"
     )
+    await db.commit()
+    news_version.bump()
     
     return news
 
 
+@logger.catch
+async def add_news_bulk(db: AsyncSession, user_id: int, 
+                        news: list[dict]) -> list:
+    """
+    Add many news items and their create actions in one transaction.
+
+    Both the news and the actions are inserted by single multi-row INSERT
+    statements.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_id (int): The ID of the user importing the news.
+        news (list[dict]): The news items with title, news_date, content,
+            category_name and image_url.
+
+    Returns:
+        list: Rows of (id, title, content, news_date, category_name, status)
+            of the added news.
+    """
+    rows = []
+    for news_ in news:
+        news_date = news_["news_date"].replace(tzinfo=None)
+        content = news_["content"]
+        rows.append({
+            "title": news_["title"], "news_date": news_date, 
+            "content": content, "category_name": news_["category_name"],
+            "image_url": news_["image_url"],
+            "excerpt": make_excerpt(content), 
+            "reading_time": get_reading_time(content),
+            "status": _get_publication_status(news_date)
+        })
+    
+    results = await db.execute(
+        insert(News).values(rows).returning(
+            News.id, News.title, News.content, News.news_date, 
+            News.category_name, News.status
+        )
+    )
+    added = results.all()
+    
+    await db.execute(
+        insert(NewsAction).values([
+            {"user_id": user_id, "news_id": row.id, "type": "create"}
+            for row in added
+        ])
+    )
+    await db.commit()
+    news_version.bump()
+    
+    return added
+
+
 @logger.catch
 async def delete_news(db: AsyncSession, user_id: int, news: News):
-    if news.status == db_constants.NEWS_AVAILABLE:
+    if news.status in (db_constants.NEWS_AVAILABLE, 
+                       db_constants.NEWS_SCHEDULED):
         news.status = db_constants.NEWS_UNAVAILABLE
-        await db.commit()
         await add_news_action(
             db, user_id=user_id, news_id=news.id, action_type="delete"
         )
+        await db.commit()
     elif news.status == db_constants.NEWS_UNAVAILABLE:
         await db.delete(news)
         await db.commit()
+    news_version.bump()
 
         
 @logger.catch    
@@ -222,19 +537,214 @@ async def update_news(db: AsyncSession, user_id, news: News, title: str,
                       image_url: str) -> News | None:    
     news.title = title
     news.news_date = news_date.replace(tzinfo=None)
+    if news.status != db_constants.NEWS_UNAVAILABLE:
+        # Moving the date also moves the publication
+        news.status = _get_publication_status(news.news_date)
     news.content = content
+    news.excerpt = make_excerpt(content)
+    news.reading_time = get_reading_time(content)
     news.category_name = category_name
     news.image_url = image_url
-    await db.commit()
-    await db.refresh(news)
     
     await add_news_action(
         db, user_id=user_id, news_id=news.id, action_type="edit"
     )
+    await db.commit()
+    news_version.bump()
     
     return news
     
    
+@logger.catch
+async def get_related_news(db: AsyncSession, 
+                           news_id: int) -> tuple[str, list[News]] | None:
+    """
+    Get the status of a news item and its precomputed related news 
+    in one statement.
+
+    Args:
+        db (AsyncSession): The database session.
+        news_id (int): The ID of the news item.
+
+    Returns:
+        tuple[str, list[News]] | None: The status of the news item and its
+            available related news, the most similar first. None if the 
+            news item is not found.
+    """
+    source = aliased(News, name="source")
+    results = await db.execute(
+        select(source.status, News)
+        .options(WITHOUT_CONTENT)
+        .select_from(source)
+        .outerjoin(NewsRelated, NewsRelated.news_id == source.id)
+        .outerjoin(
+            News, 
+            and_(
+                News.id == NewsRelated.related_id,
+                News.status == db_constants.NEWS_AVAILABLE
+            )
+        )
+        .where(source.id == news_id)
+        .order_by(NewsRelated.score.desc())
+    )
+    rows = results.tuples().all()
+    if not rows:
+        return None
+    
+    return rows[0][0], [news for _, news in rows if news is not None]
+
+
+@logger.catch
+async def update_related_news(db: AsyncSession, news_id: int,
+                              limit: int = RELATED_NEWS_SIZE) -> list[int]:
+    """
+    Recompute the related news of a news item.
+    
+    Candidates share words (stemmed) or trigrams of the title with the 
+    news item, both found on indexes, or are among the latest 
+    RELATED_CATEGORY_CANDIDATES news of its category. They are scored by 
+    trigram similarity of the titles plus text search rank of the title 
+    words, news of the same category get a bonus.
+
+    Args:
+        db (AsyncSession): The database session.
+        news_id (int): The ID of the news item.
+        limit (int): The number of related news to keep.
+
+    Returns:
+        list[int]: IDs of the related news.
+    """
+    results = await db.execute(
+        select(News.title, News.category_name).where(News.id == news_id)
+    )
+    source = results.tuples().first()
+    
+    await db.execute(delete(NewsRelated).where(NewsRelated.news_id == news_id))
+    if source is None:
+        await db.commit()
+        return []
+    
+    title, category_name = source
+    # Any word of the title matches: "word1 or word2 or ..."
+    words = func.trim(func.regexp_replace(title, r"\W+", " ", "g"))
+    query = func.websearch_to_tsquery(
+        SEARCH_CONFIG, func.replace(words, " ", " or ")
+    )
+    score = (
+        func.similarity(News.title, title)
+        + func.ts_rank_cd(News.search_vector, query)
+        + case(
+            (News.category_name == category_name, RELATED_CATEGORY_WEIGHT), 
+            else_=0
+        )
+    )
+    available = and_(
+        News.status == db_constants.NEWS_AVAILABLE, News.id != news_id
+    )
+    matches = select(News.id).where(
+        available,
+        or_(News.title.op("%")(title), News.search_vector.op("@@")(query))
+    )
+    same_category = (
+        select(News.id)
+        .where(available, News.category_name == category_name)
+        .order_by(News.news_date.desc())
+        .limit(RELATED_CATEGORY_CANDIDATES)
+    )
+    candidates = (
+        select(literal(news_id), News.id, score)
+        .where(News.id.in_(union(matches, same_category)))
+        .order_by(score.desc(), News.news_date.desc())
+        .limit(limit)
+    )
+    results = await db.execute(
+        insert(NewsRelated)
+        .from_select(["news_id", "related_id", "score"], candidates)
+        .returning(NewsRelated.related_id)
+    )
+    related_ids = results.scalars().all()
+    await db.commit()
+    return related_ids
+    
+
+@logger.catch
+async def add_news_views(db: AsyncSession, views: dict[int, int], 
+                         day: date) -> bool:
+    """
+    Add buffered views to the news totals and to the views of a day.
+
+    Args:
+        db (AsyncSession): The database session.
+        views (dict[int, int]): Views by news id.
+        day (date): The day the views were counted on.
+
+    Returns:
+        bool: True if the views were saved.
+    """
+    increments = (
+        values(
+            column("id", Integer), column("views", Integer), 
+            name="increments"
+        )
+        .data(list(views.items()))
+    )
+    await db.execute(
+        update(News)
+        .where(News.id == increments.c.id)
+        # Views are not an edit, updated_at (and so the ETags) is kept
+        .values(
+            views=News.views + increments.c.views, 
+            updated_at=News.updated_at
+        )
+    )
+    
+    # Joined with news, so views of news deleted meanwhile are skipped
+    query = postgresql.insert(NewsViews).from_select(
+        ["news_id", "day", "views"],
+        select(increments.c.id, literal(day), increments.c.views)
+        .join(News, News.id == increments.c.id)
+    )
+    await db.execute(
+        query.on_conflict_do_update(
+            index_elements=[NewsViews.news_id, NewsViews.day],
+            set_={"views": NewsViews.views + query.excluded.views}
+        )
+    )
+    await db.commit()
+    return True
+
+
+@logger.catch
+async def get_most_read_news(db: AsyncSession, since: date, 
+                             limit: int) -> list[tuple[News, int]]:
+    """
+    Get the available news with the most views since a day.
+
+    Args:
+        db (AsyncSession): The database session.
+        since (date): The first day of the period.
+        limit (int): The number of news to return.
+
+    Returns:
+        list[tuple[News, int]]: The news and their views in the period,
+            the most read first.
+    """
+    views = func.sum(NewsViews.views).label("views")
+    results = await db.execute(
+        select(News, views)
+        .options(WITHOUT_CONTENT)
+        .join(NewsViews, NewsViews.news_id == News.id)
+        .where(
+            NewsViews.day >= since, 
+            News.status == db_constants.NEWS_AVAILABLE
+        )
+        .group_by(News.id)
+        .order_by(views.desc(), News.id)
+        .limit(limit)
+    )
+    return results.tuples().all()
+    
+
 @logger.catch 
 async def get_all_news_categories(db: AsyncSession) -> list[NewsCategory]:
     results = await db.execute(select(NewsCategory))
@@ -244,14 +754,13 @@ async def get_all_news_categories(db: AsyncSession) -> list[NewsCategory]:
 @logger.catch
 async def get_all_scheduled_news(db: AsyncSession, 
                                  limit: int, offset: int, year: int | None, 
-                                 month: int | None) -> list[News]:
+                                 month: int | None, 
+                                 category: str | None = None) -> list[News]:
     query = (
         select(News)
+        .options(WITHOUT_CONTENT)
         .where(
-            and_(
-                News.news_date > datetime.now(),
-                News.status == db_constants.NEWS_AVAILABLE
-            )
+            News.status == db_constants.NEWS_SCHEDULED
         ).order_by(
             News.news_date.desc(),
             News.id.asc()
@@ -260,36 +769,154 @@ async def get_all_scheduled_news(db: AsyncSession,
         .limit(limit)
     )
     
-    if year is not None:
-        # Filter by year if provided
-        query = query.where(extract("year", News.news_date) == year)
-    if month is not None:
-        # Filter by month if provided
-        query = query.where(extract("month", News.news_date) == month)
+    # Filter by year and month if provided
+    query = _filter_by_period(query, year=year, month=month)
+    if category is not None:
+        # Filter by category if provided
+        query = query.where(News.category_name == category)
         
     results = await db.execute(query)
     return results.scalars().all()
 
 
 @logger.catch
-async def delete_expired_news(db: AsyncSession):
+async def get_all_scheduled_news_dates(db: AsyncSession) -> list[tuple[int, datetime]]:
+    """
+    Get publication dates of all scheduled news.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        list[tuple[int, datetime]]: Rows of (id, news_date).
+    """
     results = await db.execute(
-        select(NewsAction.news_id).where(
+        select(News.id, News.news_date)
+        .where(News.status == db_constants.NEWS_SCHEDULED)
+    )
+    return results.tuples().all()
+
+
+@logger.catch
+async def publish_due_news(db: AsyncSession) -> list[tuple]:
+    """
+    Publish all scheduled news whose news_date has come.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        list[tuple]: Rows of (id, title, content, news_date, category_name)
+            of the published news.
+    """
+    results = await db.execute(
+        update(News)
+        .where(
             and_(
-                NewsAction.type == "delete",
-                NewsAction.created_at.op('+')(
-                    timedelta(days=db_constants.DELETE_NEWS_AFTER)) 
-                < datetime.now()
+                News.status == db_constants.NEWS_SCHEDULED,
+                News.news_date <= datetime.now()
             )
         )
+        .values(status=db_constants.NEWS_AVAILABLE)
+        .returning(
+            News.id, News.title, News.content, News.news_date, 
+            News.category_name
+        )
     )
-    news_ids = results.scalars().all()
+    published = results.tuples().all()
+    await db.commit()
     
-    await db.execute(
-        delete(News).where(
+    if published:
+        news_version.bump()
+    
+    return published
+
+
+async def stream_news_with_actions(db: AsyncSession) -> AsyncIterator:
+    """
+    Stream all news joined with their actions through a server-side cursor.
+
+    Only EXPORT_CHUNK_SIZE rows are held in memory at once.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Yields:
+        Row: Rows of news fields and action fields, the action fields are
+            None for news without actions.
+    """
+    results = await db.stream(
+        select(
+            News.id, News.title, News.news_date, News.content, 
+            News.category_name, News.image_url, News.status, 
+            News.created_at, News.updated_at,
+            NewsAction.id.label("action_id"), 
+            NewsAction.type.label("action_type"),
+            NewsAction.user_id.label("action_user_id"),
+            NewsAction.created_at.label("action_created_at")
+        )
+        .outerjoin(NewsAction, NewsAction.news_id == News.id)
+        .order_by(News.id, NewsAction.id)
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+    async for row in results:
+        yield row
+
+
+@logger.catch
+async def delete_expired_news(db: AsyncSession, 
+                              chunk_size: int = PURGE_CHUNK_SIZE) -> int:
+    """
+    Delete news that were deleted by users more than DELETE_NEWS_AFTER 
+    days ago.
+
+    News are deleted in chunks, every chunk is a separate transaction,
+    so the purge never holds long locks and the event loop can serve 
+    requests between chunks.
+
+    Args:
+        db (AsyncSession): The database session.
+        chunk_size (int): The maximum number of news deleted per chunk.
+
+    Returns:
+        int: The number of deleted news.
+    """
+    expired_before = datetime.now() - timedelta(
+        days=db_constants.DELETE_NEWS_AFTER
+    )
+    chunk = (
+        select(News.id)
+        .join(NewsAction, NewsAction.news_id == News.id)
+        .where(
             and_(
-                News.status == db_constants.NEWS_UNAVAILABLE,   
-                News.id.in_(news_ids)        
+                News.status == db_constants.NEWS_UNAVAILABLE,
+                NewsAction.type == "delete",
+                NewsAction.created_at < expired_before
             )
         )
-    )
\ No newline at end of file
+        .distinct()
+        .limit(chunk_size)
+    )
+    
+    deleted = 0
+    while True:
+        results = await db.execute(
+            delete(News)
+            .where(News.id.in_(chunk.scalar_subquery()))
+            .returning(News.id)
+            .execution_options(synchronize_session=False)
+        )
+        chunk_deleted = len(results.scalars().all())
+        await db.commit()
+        
+        deleted += chunk_deleted
+        if chunk_deleted < chunk_size:
+            break
+        
+        # Let other tasks run between the chunks
+        await asyncio.sleep(0)
+    
+    if deleted:
+        news_version.bump()
+    
+    return deleted
\ No newline at end of file
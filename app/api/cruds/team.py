@@ -2,6 +2,7 @@ from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.dependencies.cache import events_version
 from app.api.models import Team
 
 
@@ -35,6 +36,8 @@ async def edit_team(db: AsyncSession, team: Team, name: str,
     team.name = name
     team.logo_url = logo_url
     await db.commit()
+    # Cached events show the names and logos of their teams
+    events_version.bump()
     await db.refresh(team)
     
     return team
@@ -43,4 +46,5 @@ async def edit_team(db: AsyncSession, team: Team, name: str,
 @logger.catch
 async def delete_team(db: AsyncSession, team: Team):
     await db.delete(team)
-    await db.commit()
\ No newline at end of file
+    await db.commit()
+    events_version.bump()
\ No newline at end of file
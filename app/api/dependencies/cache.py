@@ -0,0 +1,196 @@
+import asyncio
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+MISSING = object()
+
+
+class Version:
+    """
+    Counter of writes to the data a cache depends on.
+
+    Every write bumps the counter, entries cached under an older value
+    are no longer returned.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def bump(self):
+        self.value += 1
+
+
+class ResponseCache:
+    """
+    In-process LRU cache with TTL and version based invalidation.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024,
+                 version: Version | None = None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = version or Version()
+        self._entries: OrderedDict[tuple, tuple[float, int, Any]] = OrderedDict()
+        # Loads in progress, concurrent misses of a key wait for the same one
+        self._loading: dict[tuple, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.shared_loads = 0
+
+    @staticmethod
+    def make_key(name: str, **params) -> tuple:
+        """
+        Build a cache key from the name of the cached call and its params.
+
+        Params that are None are dropped, strings are stripped and their
+        whitespace is collapsed, so equivalent requests share one key.
+
+        Args:
+            name (str): The name of the cached call.
+            **params: The params of the call.
+
+        Returns:
+            tuple: The cache key.
+        """
+        normalized = []
+        for param, value in sorted(params.items()):
+            if value is None:
+                continue
+            if isinstance(value, Enum):
+                value = value.value
+            if isinstance(value, str):
+                value = " ".join(value.split())
+            normalized.append((param, value))
+        return (name, tuple(normalized))
+
+    def get(self, key: tuple) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            Any: The cached value or MISSING if it is absent, expired or
+                was cached before the last write.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISSING
+
+        expires_at, version, value = entry
+        if expires_at < time.monotonic() or version != self.version.value:
+            del self._entries[key]
+            self.misses += 1
+            return MISSING
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: tuple, value: Any, ttl: float | None = None,
+            version: int | None = None):
+        """
+        Cache a value under the current version.
+
+        Args:
+            key (tuple): The cache key.
+            value (Any): The value to cache.
+            ttl (float | None): Seconds to keep the value, the cache TTL
+                if not provided.
+            version (int | None): The version the value was loaded at,
+                the current one if not provided.
+        """
+        if version is None:
+            version = self.version.value
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, version, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    async def get_or_load(self, key: tuple, load: Callable[[], Awaitable[Any]],
+                          ttl: float | None = None) -> Any:
+        """
+        Get a cached value or load and cache it.
+
+        Concurrent misses of the same key share one load instead of 
+        running it once per request. If the request running the load is
+        cancelled, the waiting ones don't inherit the cancellation.
+
+        Args:
+            key (tuple): The cache key.
+            load (Callable[[], Awaitable[Any]]): Loads the value on a miss.
+            ttl (float | None): Seconds to keep the value, the cache TTL
+                if not provided.
+
+        Returns:
+            Any: The cached or the loaded value.
+        """
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+
+        while (loading := self._loading.get(key)) is not None:
+            self.shared_loads += 1
+            try:
+                return await asyncio.shield(loading)
+            except asyncio.CancelledError:
+                # Only the request running the load was cancelled,
+                # this one loads the value itself (or waits for another load)
+                if loading.cancelled() and not asyncio.current_task().cancelling():
+                    continue
+                raise
+
+        # A write during the load makes the value stale,
+        # so it is cached under the version it was loaded at
+        version = self.version.value
+        loading = asyncio.get_running_loop().create_future()
+        self._loading[key] = loading
+        try:
+            value = await load()
+        except asyncio.CancelledError:
+            loading.cancel()
+            raise
+        except Exception as err:
+            loading.set_exception(err)
+            # Waiters get the error, don't report it as never retrieved
+            loading.exception()
+            raise
+        finally:
+            del self._loading[key]
+
+        loading.set_result(value)
+        self.set(key, value, ttl=ttl, version=version)
+        return value
+
+    def stats(self) -> dict:
+        """
+        Get the usage of the cache.
+
+        Returns:
+            dict: Numbers of entries, hits, misses, misses served by a load
+                of a concurrent request and the hit ratio.
+        """
+        requests = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_loads": self.shared_loads,
+            "hit_ratio": round(self.hits / requests, 3) if requests else 0.0,
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+
+# Bumped by every write to news
+news_version = Version()
+# Bumped by every write to events
+events_version = Version()
@@ -1,13 +1,25 @@
+import time
 from asyncio import Lock
+from datetime import date, datetime
 
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from loguru import logger
 
 from app.api.cruds import news, refresh_token
 from app.api.dependencies.database import SessionLocal
+from app.api.dependencies.feeds import refresh_news_feeds
+from app.api.dependencies.news_index import news_index
+from app.api.dependencies.suggestions import title_suggestions
+from app.api.dependencies.views import news_views
 
 lock = Lock()
 
+# Seconds between writes of the buffered news views
+VIEWS_FLUSH_INTERVAL = 5
+# Minutes between checks for overdue scheduled news
+PUBLISH_CHECK_INTERVAL = 1
+
 scheduled_cleaner = AsyncIOScheduler()
 
 
@@ -31,7 +43,129 @@ async def clean_news():
         async with SessionLocal() as db:
             try:
                 logger.info("Starting to delete expired news...")
-                await news.delete_expired_news(db)
+                started_at = time.perf_counter()
+                deleted = await news.delete_expired_news(db)
+                logger.info(
+                    f"Deleted {deleted} expired news in "
+                    f"{time.perf_counter() - started_at:.2f}s."
+                )
             finally:
                 await db.close()
-                logger.info("Expired news successful deleted.")
\ No newline at end of file
+
+
+@scheduled_cleaner.scheduled_job("interval", seconds=VIEWS_FLUSH_INTERVAL)
+async def flush_news_views():
+    views = news_views.take()
+    if not views:
+        return
+    
+    async with SessionLocal() as db:
+        saved = await news.add_news_views(db, views=views, day=date.today())
+    if not saved:
+        # Written with the next flush
+        news_views.restore(views)
+
+
+@logger.catch
+async def publish_news():
+    async with SessionLocal() as db:
+        published = await news.publish_due_news(db)
+    
+    if not published:
+        return
+    
+    schedule_feeds_refresh()
+    for row in published:
+        schedule_related_news_update(row[0])
+    
+    for news_id, title, _, news_date, _ in published:
+        title_suggestions.add(news_id, title=title, news_date=news_date)
+    
+    if news_index.enabled:
+        for news_id, title, content, news_date, category_name in published:
+            news_index.add(
+                news_id, title=title, content=content, news_date=news_date,
+                category_name=category_name
+            )
+    
+    logger.info(f"Published scheduled news: {[row[0] for row in published]}")
+
+
+@scheduled_cleaner.scheduled_job("interval", minutes=PUBLISH_CHECK_INTERVAL)
+async def publish_overdue_news():
+    # Backstop of the in-memory date jobs: a publication that failed 
+    # (e.g. the database was unavailable at news_date) is retried here
+    await publish_news()
+
+
+def schedule_news_publication(news_id: int, news_date: datetime):
+    """
+    Schedule publication of a scheduled news item at its news_date.
+
+    Rescheduling the same news item replaces its previous job.
+
+    Args:
+        news_id (int): The ID of the news item.
+        news_date (datetime): The publication date.
+    """
+    scheduled_cleaner.add_job(
+        publish_news, "date", run_date=news_date, 
+        id=f"publish_news_{news_id}", replace_existing=True, 
+        # Publish even if the date was missed, e.g. while restarting
+        misfire_grace_time=None
+    )
+
+
+def unschedule_news_publication(news_id: int):
+    try:
+        scheduled_cleaner.remove_job(f"publish_news_{news_id}")
+    except JobLookupError:
+        pass
+
+
+async def schedule_all_news_publications():
+    """
+    Publish overdue news and schedule publication of the rest.
+    Called at startup, the jobs are kept in memory only.
+    """
+    await publish_news()
+    
+    async with SessionLocal() as db:
+        scheduled = await news.get_all_scheduled_news_dates(db)
+    
+    for news_id, news_date in scheduled:
+        schedule_news_publication(news_id, news_date)
+
+
+def schedule_feeds_refresh():
+    """
+    Render the news feeds again in the background.
+
+    Writes in a row replace the pending job, so they are rendered once.
+    """
+    scheduled_cleaner.add_job(
+        refresh_news_feeds, id="refresh_news_feeds", replace_existing=True
+    )
+
+
+@logger.catch
+async def update_related_news(news_id: int):
+    async with SessionLocal() as db:
+        related_ids = await news.update_related_news(db, news_id=news_id)
+        # The news item may now belong to the lists of its related news
+        for related_id in related_ids or []:
+            await news.update_related_news(db, news_id=related_id)
+
+
+def schedule_related_news_update(news_id: int):
+    """
+    Recompute the related news of a created or edited news item
+    in the background.
+
+    Args:
+        news_id (int): The ID of the news item.
+    """
+    scheduled_cleaner.add_job(
+        update_related_news, args=[news_id], 
+        id=f"update_related_news_{news_id}", replace_existing=True
+    )
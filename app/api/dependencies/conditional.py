@@ -0,0 +1,76 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts) -> str:
+    """
+    Make a strong ETag from the values that identify a response version.
+
+    Args:
+        *parts: The values, e.g. the name of the resource, its params
+            and its updated_at.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def format_last_modified(last_modified: datetime) -> str:
+    # Naive datetimes of the database are in the server local time
+    return format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+
+def is_not_modified(request: Request, etag: str,
+                    last_modified: datetime | None) -> bool:
+    """
+    Check whether the client already has this version of the response.
+
+    If-None-Match takes precedence over If-Modified-Since, as RFC 9110
+    requires.
+
+    Args:
+        request (Request): The request with conditional headers.
+        etag (str): The ETag of the current version.
+        last_modified (datetime | None): The modification date of the
+            current version.
+
+    Returns:
+        bool: True if 304 Not Modified can be returned.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    # HTTP dates have no fractions of a second
+    modified = last_modified.astimezone(timezone.utc).replace(microsecond=0)
+    return modified <= since
+
+
+def set_validators(response: Response, etag: str,
+                   last_modified: datetime | None):
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_last_modified(last_modified)
+
+
+def not_modified(etag: str, last_modified: datetime | None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag=etag, last_modified=last_modified)
+    return response
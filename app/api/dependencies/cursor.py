@@ -0,0 +1,43 @@
+import base64
+import json
+from datetime import datetime
+
+from app.api.dependencies.exceptions import InvalidCursor
+
+
+def encode_cursor(news_date: datetime, news_id: int) -> str:
+    """
+    Encode the position of the last returned news item into an opaque cursor.
+
+    Args:
+        news_date (datetime): The date of the last returned news item.
+        news_id (int): The ID of the last returned news item.
+
+    Returns:
+        str: The url-safe cursor string.
+    """
+    payload = json.dumps([news_date.isoformat(), news_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): The cursor string received from the client.
+
+    Raises:
+        InvalidCursor: If the cursor is malformed.
+
+    Returns:
+        tuple[datetime, int]: The date and the ID of the last seen news item.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        news_date, news_id = json.loads(
+            base64.urlsafe_b64decode(cursor + padding)
+        )
+        return datetime.fromisoformat(news_date), int(news_id)
+    except Exception:
+        raise InvalidCursor
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import (AsyncAttrs, async_sessionmaker,
                                     create_async_engine)
 from sqlalchemy.orm import (DeclarativeBase, Mapped, declared_attr,
                             mapped_column)
+from sqlalchemy.pool import NullPool
 
 from app.config import get_db_url
 
@@ -14,6 +15,18 @@ SQLALCHEMY_DATABASE_URL = get_db_url()
 engine = create_async_engine(SQLALCHEMY_DATABASE_URL)
 SessionLocal = async_sessionmaker(bind=engine, expire_on_commit=False)
 
+# Long read-only streams (exports) get their own connections, so they 
+# never hold a connection of the request pool. REPEATABLE READ gives 
+# the whole stream one consistent snapshot
+export_engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=NullPool, 
+    isolation_level="REPEATABLE READ", 
+    execution_options={"postgresql_readonly": True}
+)
+ExportSessionLocal = async_sessionmaker(
+    bind=export_engine, expire_on_commit=False
+)
+
 created_at = Annotated[datetime, mapped_column(server_default=func.now())]
 updated_at = Annotated[datetime, mapped_column(server_default=func.now(), onupdate=datetime.now)]
 
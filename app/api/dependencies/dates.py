@@ -0,0 +1,24 @@
+from datetime import datetime
+
+
+def get_period_bounds(year: int, month: int | None = None) -> tuple[datetime, datetime]:
+    """
+    Get the half-open [start, end) datetime range of a year or of a month.
+
+    Comparing a column with these bounds (instead of extract()) lets
+    Postgres use an index on that column.
+
+    Args:
+        year (int): The year of the period.
+        month (int | None): The month of the period, the whole year if None.
+
+    Returns:
+        tuple[datetime, datetime]: The start (inclusive) and the end (exclusive).
+    """
+    if month is None:
+        return datetime(year, 1, 1), datetime(year + 1, 1, 1)
+
+    if month == 12:
+        return datetime(year, 12, 1), datetime(year + 1, 1, 1)
+
+    return datetime(year, month, 1), datetime(year, month + 1, 1)
@@ -27,4 +27,9 @@ class EventPages(Enum):
     
 class ImageFormats(Enum):
     JPG = "jpg"
-    PNG = "png"
\ No newline at end of file
+    PNG = "png"
+    
+    
+class ExportFormats(Enum):
+    CSV = "csv"
+    NDJSON = "ndjson"
\ No newline at end of file
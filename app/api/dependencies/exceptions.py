@@ -150,4 +150,36 @@ class InvalidEmail(HTTPException):
         super().__init__(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Некорректная почта"
+        )
+        
+
+class InvalidCursor(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор"
+        )
+        
+
+class FeedUnavailable(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Лента новостей недоступна"
+        )
+        
+
+class InvalidNewsIds(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный список новостей"
+        )
+        
+
+class EventVersionConflict(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Событие уже изменено, обновите данные"
         )
\ No newline at end of file
@@ -0,0 +1,195 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from xml.etree import ElementTree
+
+from loguru import logger
+
+from app.api.cruds import news
+from app.api.dependencies.database import SessionLocal
+from app.config import settings
+
+# Number of the latest news in every feed
+FEED_SIZE = 30
+FEED_TITLE = "Новости Kokoc Group"
+FEED_AUTHOR = "Kokoc Group"
+
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+
+
+@dataclass(frozen=True)
+class RenderedFeed:
+    media_type: str
+    body: bytes
+    gzip_body: bytes
+    etag: str
+    # The encodings are different representations, so their ETags differ
+    gzip_etag: str
+    last_modified: datetime | None
+
+
+class NewsFeeds:
+    """
+    RSS, Atom and JSON Feed of the latest news, rendered once per write.
+
+    The feeds are kept as ready bytes (and their gzip variants), so serving
+    them touches neither the database nor pydantic.
+    """
+
+    def __init__(self):
+        self._feeds: dict[str, RenderedFeed] = {}
+
+    def get(self, format: str) -> RenderedFeed | None:
+        return self._feeds.get(format)
+
+    def render(self, items: list) -> None:
+        """
+        Render all feeds from the latest news.
+
+        Args:
+            items (list): The latest available news, the newest first.
+        """
+        last_modified = max(
+            (item.updated_at for item in items), default=None
+        )
+        feeds = {
+            "rss": ("application/rss+xml; charset=utf-8", _render_rss(items)),
+            "atom": ("application/atom+xml; charset=utf-8", _render_atom(items)),
+            "json": ("application/feed+json; charset=utf-8", _render_json(items)),
+        }
+        # Replaced at once, so a request never sees a half-rendered set
+        self._feeds = {
+            format: _make_feed(media_type, body, last_modified=last_modified)
+            for format, (media_type, body) in feeds.items()
+        }
+
+
+def _make_feed(media_type: str, body: bytes, 
+               last_modified: datetime | None) -> RenderedFeed:
+    digest = hashlib.sha1(body).hexdigest()
+    return RenderedFeed(
+        media_type=media_type, body=body, 
+        gzip_body=gzip.compress(body, mtime=0), etag=f'"{digest}"', 
+        gzip_etag=f'"{digest}-gz"', last_modified=last_modified
+    )
+
+
+@logger.catch
+async def refresh_news_feeds():
+    async with SessionLocal() as db:
+        items = await news.get_all_news(
+            db, limit=FEED_SIZE, offset=0, year=None, month=None,
+            category=None
+        )
+    if items is None:
+        return
+
+    news_feeds.render(items)
+
+
+def _get_news_url(news_id: int) -> str:
+    return f"{settings.SITE_URL}/news/{news_id}"
+
+
+def _get_image_type(image_url: str | None) -> str | None:
+    if not image_url:
+        return None
+
+    media_type, _ = mimetypes.guess_type(image_url)
+    if media_type is None or not media_type.startswith("image/"):
+        return None
+    return media_type
+
+
+def _to_utc(date: datetime) -> datetime:
+    # Naive datetimes of the database are in the server local time
+    return date.astimezone(timezone.utc)
+
+
+def _render_rss(items: list) -> bytes:
+    rss = ElementTree.Element("rss", version="2.0")
+    channel = ElementTree.SubElement(rss, "channel")
+    ElementTree.SubElement(channel, "title").text = FEED_TITLE
+    ElementTree.SubElement(channel, "link").text = f"{settings.SITE_URL}/news"
+    ElementTree.SubElement(channel, "description").text = FEED_TITLE
+
+    for item in items:
+        element = ElementTree.SubElement(channel, "item")
+        ElementTree.SubElement(element, "title").text = item.title
+        ElementTree.SubElement(element, "link").text = _get_news_url(item.id)
+        ElementTree.SubElement(element, "guid").text = _get_news_url(item.id)
+        ElementTree.SubElement(element, "description").text = item.excerpt
+        ElementTree.SubElement(element, "category").text = item.category_name
+        ElementTree.SubElement(element, "pubDate").text = format_datetime(
+            _to_utc(item.news_date), usegmt=True
+        )
+        # Images of an unknown type are left out, the size is unknown 
+        # and 0 as the RSS Best Practices Profile advises
+        image_type = _get_image_type(item.image_url)
+        if image_type is not None:
+            ElementTree.SubElement(
+                element, "enclosure", url=item.image_url, type=image_type,
+                length="0"
+            )
+
+    return ElementTree.tostring(rss, encoding="utf-8", xml_declaration=True)
+
+
+def _render_atom(items: list) -> bytes:
+    ElementTree.register_namespace("", ATOM_NAMESPACE)
+
+    def element(parent, tag, text=None, **attrs):
+        child = ElementTree.SubElement(parent, f"{{{ATOM_NAMESPACE}}}{tag}", attrs)
+        child.text = text
+        return child
+
+    feed = ElementTree.Element(f"{{{ATOM_NAMESPACE}}}feed")
+    element(feed, "id", f"{settings.SITE_URL}/news")
+    element(feed, "title", FEED_TITLE)
+    element(feed, "link", href=f"{settings.SITE_URL}/news")
+    # Required for the entries, which have no authors of their own
+    author = element(feed, "author")
+    element(author, "name", FEED_AUTHOR)
+    updated = max((item.updated_at for item in items), default=datetime.now())
+    element(feed, "updated", _to_utc(updated).isoformat())
+
+    for item in items:
+        entry = element(feed, "entry")
+        element(entry, "id", _get_news_url(item.id))
+        element(entry, "title", item.title)
+        element(entry, "link", href=_get_news_url(item.id))
+        element(entry, "published", _to_utc(item.news_date).isoformat())
+        element(entry, "updated", _to_utc(item.updated_at).isoformat())
+        element(entry, "summary", item.excerpt)
+        element(entry, "category", term=item.category_name)
+
+    return ElementTree.tostring(feed, encoding="utf-8", xml_declaration=True)
+
+
+def _render_json(items: list) -> bytes:
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "home_page_url": f"{settings.SITE_URL}/news",
+        "items": [
+            {
+                "id": str(item.id),
+                "url": _get_news_url(item.id),
+                "title": item.title,
+                "summary": item.excerpt,
+                "image": item.image_url,
+                "date_published": _to_utc(item.news_date).isoformat(),
+                "date_modified": _to_utc(item.updated_at).isoformat(),
+                "tags": [item.category_name],
+            }
+            for item in items
+        ],
+    }
+    return json.dumps(feed, ensure_ascii=False).encode()
+
+
+news_feeds = NewsFeeds()
@@ -0,0 +1,185 @@
+import asyncio
+import json
+
+import asyncpg
+from loguru import logger
+
+from app.config import get_db_url
+
+# Messages waiting for one subscriber, a subscriber that falls further
+# behind is dropped instead of slowing down the others
+QUEUE_SIZE = 16
+# Postgres channel carrying the updates between workers
+NOTIFY_CHANNEL = "events_live"
+# Seconds between attempts to reconnect the listening connection
+RECONNECT_INTERVAL = 5
+
+
+def get_score_message(event) -> str:
+    """
+    Make a live update message of an event.
+
+    Args:
+        event: The event, a model or a schema with the score fields.
+
+    Returns:
+        str: The JSON message.
+    """
+    return json.dumps({
+        "id": event.id,
+        "first_team_score": event.first_team_score,
+        "second_team_score": event.second_team_score,
+        "start_date": event.start_date.isoformat(),
+        "end_date": event.end_date.isoformat() if event.end_date else None,
+    })
+
+
+class LiveBroker:
+    """
+    In-process pub/sub of live event updates.
+
+    Every subscriber has its own bounded queue, publishing never waits
+    for a subscriber. With the Postgres bridge started, updates are sent
+    with NOTIFY and every worker delivers them to its own subscribers.
+    """
+
+    def __init__(self):
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        # The listening connection is only used for LISTEN, asyncpg doesn't
+        # allow concurrent operations on one connection, so NOTIFY is sent 
+        # from a pool
+        self._listener: asyncpg.Connection | None = None
+        self._pool: asyncpg.Pool | None = None
+        self._reconnecting: asyncio.Task | None = None
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, event_id: int) -> asyncio.Queue:
+        """
+        Subscribe to the updates of an event.
+
+        Args:
+            event_id (int): The ID of the event.
+
+        Returns:
+            asyncio.Queue: The queue of the messages, None in the queue
+                means the subscriber was dropped for falling behind.
+        """
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._subscribers.setdefault(event_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, event_id: int, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(event_id)
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[event_id]
+
+    async def publish(self, event_id: int, message: str) -> None:
+        """
+        Publish an update of an event to its subscribers of all workers.
+
+        Args:
+            event_id (int): The ID of the event.
+            message (str): The message.
+        """
+        if self._pool is not None:
+            try:
+                await self._pool.execute(
+                    "SELECT pg_notify($1, $2)", NOTIFY_CHANNEL,
+                    f"{event_id}:{message}"
+                )
+                return
+            except Exception as err:
+                # At least the subscribers of this worker get the update
+                logger.error(err)
+
+        self._deliver(event_id, message)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": self.subscriber_count(),
+            "events": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "bridge": self._pool is not None,
+            "listening": self._listener is not None,
+        }
+
+    async def start_bridge(self) -> None:
+        """
+        Listen to the updates published by all workers.
+        """
+        self._pool = await asyncpg.create_pool(
+            _get_dsn(), min_size=1, max_size=4
+        )
+        await self._listen()
+
+    async def stop_bridge(self) -> None:
+        pool, self._pool = self._pool, None
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+            self._reconnecting = None
+
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            await listener.close()
+        if pool is not None:
+            await pool.close()
+
+    async def _listen(self) -> None:
+        listener = await asyncpg.connect(_get_dsn())
+        listener.add_termination_listener(self._on_listener_terminated)
+        await listener.add_listener(NOTIFY_CHANNEL, self._on_notify)
+        self._listener = listener
+
+    def _on_listener_terminated(self, connection) -> None:
+        if connection is not self._listener:
+            # Closed by stop_bridge
+            return
+
+        self._listener = None
+        logger.error("Live events listener connection is lost, reconnecting")
+        self._reconnecting = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while self._pool is not None:
+            try:
+                await self._listen()
+                logger.info("Live events listener is reconnected")
+                return
+            except Exception as err:
+                logger.error(err)
+                await asyncio.sleep(RECONNECT_INTERVAL)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        event_id, message = payload.split(":", 1)
+        self._deliver(int(event_id), message)
+
+    def _deliver(self, event_id: int, message: str) -> None:
+        self.published += 1
+        for queue in list(self._subscribers.get(event_id, ())):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # The stream of a slow consumer is closed,
+                # the client reconnects and gets the current state
+                self.unsubscribe(event_id, queue)
+                self.dropped += 1
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+                logger.info(f"Dropped a slow live subscriber of event {event_id}")
+
+
+def _get_dsn() -> str:
+    return get_db_url().replace("postgresql+asyncpg://", "postgresql://")
+
+
+live_broker = LiveBroker()
@@ -0,0 +1,245 @@
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from app.api.dependencies.dates import get_period_bounds
+from app.api.dependencies.text import strip_tags
+
+TOKEN_PATTERN = re.compile(r"\w{2,}")
+
+
+def tokenize(text: str) -> set[str]:
+    """
+    Split a text into the set of its normalized words.
+
+    Args:
+        text (str): The text to split, may contain html tags.
+
+    Returns:
+        set[str]: Lowercased words of two or more characters.
+    """
+    text = strip_tags(text).lower().replace("ё", "е")
+    return set(TOKEN_PATTERN.findall(text))
+
+
+def get_trigrams(token: str, prefix_only: bool = False) -> set[str]:
+    """
+    Get the trigrams of a token padded like pg_trgm does.
+
+    Args:
+        token (str): The token.
+        prefix_only (bool): Don't pad the end of the token, so the trigrams
+            match every token that starts with this one.
+
+    Returns:
+        set[str]: The trigrams.
+    """
+    padded = "  " + token + ("" if prefix_only else " ")
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NewsSearchIndex:
+    """
+    In-memory inverted index over titles and contents of available news.
+
+    Words are mapped to sorted arrays of news ids, trigrams of the words
+    are mapped to sorted arrays of word ids, so every query word is matched
+    as a prefix (which also covers most russian word forms) without keeping
+    the texts in memory.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.build_time = 0.0
+        # word -> word id and word id -> word
+        self._words: dict[str, int] = {}
+        self._word_list: list[str] = []
+        # word id -> sorted news ids
+        self._postings: list[array] = []
+        # trigram -> sorted word ids
+        self._trigrams: dict[str, array] = {}
+        # news id -> (news_date, category_name)
+        self._documents: dict[int, tuple[datetime, str]] = {}
+
+    def build(self, rows) -> None:
+        """
+        Replace the index content with the given news.
+
+        Args:
+            rows: Iterable of (id, title, content, news_date, category_name).
+        """
+        started_at = time.perf_counter()
+
+        self._words = {}
+        self._word_list = []
+        self._postings = []
+        self._trigrams = {}
+        self._documents = {}
+        for news_id, title, content, news_date, category_name in rows:
+            self.add(news_id, title, content, news_date, category_name)
+
+        self.build_time = time.perf_counter() - started_at
+        self.enabled = True
+
+    def add(self, news_id: int, title: str, content: str,
+            news_date: datetime, category_name: str) -> None:
+        """
+        Add a news item to the index.
+
+        Args:
+            news_id (int): The ID of the news item.
+            title (str): The title of the news item.
+            content (str): The content of the news item.
+            news_date (datetime): The publication date of the news item.
+            category_name (str): The name of the news category.
+        """
+        if news_id in self._documents:
+            # Document words are not stored, so the old postings can't be
+            # found, the caller has to remove the document first
+            raise ValueError(f"News {news_id} is already indexed")
+
+        self._documents[news_id] = (news_date, category_name)
+
+        for word in tokenize(title) | tokenize(content):
+            word_id = self._words.get(word)
+            if word_id is None:
+                word = sys.intern(word)
+                word_id = len(self._word_list)
+                self._words[word] = word_id
+                self._word_list.append(word)
+                self._postings.append(array("I"))
+                for trigram in get_trigrams(word):
+                    # Word ids only grow, so the arrays stay sorted
+                    self._trigrams.setdefault(trigram, array("I")).append(word_id)
+
+            _insert(self._postings[word_id], news_id)
+
+    def remove(self, news_id: int, title: str, content: str) -> None:
+        """
+        Remove a news item from the index.
+
+        Args:
+            news_id (int): The ID of the news item.
+            title (str): The title the news item was indexed with.
+            content (str): The content the news item was indexed with.
+        """
+        if self._documents.pop(news_id, None) is None:
+            return
+
+        for word in tokenize(title) | tokenize(content):
+            word_id = self._words.get(word)
+            if word_id is not None:
+                _discard(self._postings[word_id], news_id)
+
+    def search(self, query: str, limit: int, offset: int,
+               year: int | None = None, month: int | None = None,
+               category: str | None = None) -> list[int]:
+        """
+        Find published news containing every word of the query.
+
+        Args:
+            query (str): The search query.
+            limit (int): The number of news ids to return.
+            offset (int): The offset from the start of the result set.
+            year (int | None): The year to filter by, if provided.
+            month (int | None): The month to filter by, if provided.
+            category (str | None): The category to filter by, if provided.
+
+        Returns:
+            list[int]: IDs of found news, the newest first.
+        """
+        found: set[int] | None = None
+        for word in tokenize(query):
+            matches = self._match_word(word)
+            found = matches if found is None else found & matches
+            if not found:
+                return []
+
+        if found is None:
+            return []
+
+        start, end = datetime.min, datetime.now()
+        if year is not None:
+            try:
+                start, end = get_period_bounds(year, month)
+            except ValueError:
+                return []
+            end = min(end, datetime.now())
+
+        results = []
+        for news_id in found:
+            news_date, category_name = self._documents[news_id]
+            if not start <= news_date < end:
+                continue
+            if year is None and month is not None and news_date.month != month:
+                continue
+            if category is not None and category_name != category:
+                continue
+            results.append((news_date, news_id))
+
+        # Same order as the news feed: news_date desc, id asc
+        results.sort(key=lambda result: (result[0], -result[1]), reverse=True)
+        return [news_id for _, news_id in results[offset:offset + limit]]
+
+    def stats(self) -> dict:
+        """
+        Get the size of the index.
+
+        Returns:
+            dict: Numbers of documents, words, trigrams and postings,
+                approximate memory usage in bytes and the build time.
+        """
+        postings = sum(len(ids) for ids in self._postings)
+        memory = (
+            sum(sys.getsizeof(ids) for ids in self._postings)
+            + sum(sys.getsizeof(ids) for ids in self._trigrams.values())
+            + sum(sys.getsizeof(word) for word in self._words)
+            + sum(sys.getsizeof(trigram) for trigram in self._trigrams)
+            + sys.getsizeof(self._words) + sys.getsizeof(self._word_list)
+            + sys.getsizeof(self._trigrams)
+            + sys.getsizeof(self._postings) + sys.getsizeof(self._documents)
+        )
+        return {
+            "documents": len(self._documents),
+            "words": len(self._words),
+            "trigrams": len(self._trigrams),
+            "postings": postings,
+            "memory_bytes": memory,
+            "build_time_seconds": round(self.build_time, 3),
+        }
+
+    def _match_word(self, word: str) -> set[int]:
+        word_ids: array | None = None
+        for trigram in get_trigrams(word, prefix_only=True):
+            ids = self._trigrams.get(trigram)
+            if ids is None:
+                return set()
+            if word_ids is None or len(ids) < len(word_ids):
+                word_ids = ids
+
+        # The shortest trigram list narrows the candidates,
+        # the prefix check removes false positives
+        news_ids = set()
+        for word_id in word_ids:
+            if self._word_list[word_id].startswith(word):
+                news_ids.update(self._postings[word_id])
+        return news_ids
+
+
+def _insert(ids: array, news_id: int) -> None:
+    if not ids or ids[-1] < news_id:
+        ids.append(news_id)
+    else:
+        insort(ids, news_id)
+
+
+def _discard(ids: array, news_id: int) -> None:
+    index = bisect_left(ids, news_id)
+    if index < len(ids) and ids[index] == news_id:
+        del ids[index]
+
+
+news_index = NewsSearchIndex()
@@ -0,0 +1,169 @@
+import heapq
+import re
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+
+from app.api.dependencies.text import strip_tags
+
+WORD_PATTERN = re.compile(r"\w+")
+
+# Queries up to this length are answered from the date-ordered news lists
+# of their prefix, they match too many titles to rank on every query
+SHORT_PREFIX_LENGTH = 3
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalize a title or a typed query for prefix matching.
+
+    Args:
+        title (str): The title, may contain html tags.
+
+    Returns:
+        str: Lowercased words separated by single spaces, ё replaced by е.
+    """
+    text = strip_tags(title).lower().replace("ё", "е")
+    return " ".join(WORD_PATTERN.findall(text))
+
+
+class TitleSuggestions:
+    """
+    Sorted array of normalized titles of available news for search-as-you-type.
+
+    Every title is stored once per word, as the suffix of the title starting
+    at that word, so a query matches the beginning of any word of a title
+    with one binary search. Besides, the news are kept ordered by date for 
+    every prefix of up to SHORT_PREFIX_LENGTH characters of these suffixes, 
+    so the newest matches of a short query are read without ranking.
+    """
+
+    def __init__(self):
+        self.build_time = 0.0
+        # Sorted (suffix, news id) pairs
+        self._keys: list[tuple[str, int]] = []
+        # news id -> (title, news_date)
+        self._titles: dict[int, tuple[str, datetime]] = {}
+        # Short prefix -> sorted (news_date, -news id), the newest last
+        self._recent: dict[str, list[tuple[datetime, int]]] = {}
+
+    def build(self, rows) -> None:
+        """
+        Replace the content with the given news.
+
+        Args:
+            rows: Iterable of (id, title, news_date).
+        """
+        started_at = time.perf_counter()
+
+        titles = {}
+        keys = []
+        recent = {}
+        for news_id, title, news_date in rows:
+            titles[news_id] = (title, news_date)
+            suffixes = _get_suffixes(title)
+            keys.extend((suffix, news_id) for suffix in suffixes)
+            for prefix in _get_short_prefixes(suffixes):
+                recent.setdefault(prefix, []).append((news_date, -news_id))
+        keys.sort()
+        for entries in recent.values():
+            entries.sort()
+
+        self._titles, self._keys, self._recent = titles, keys, recent
+        self.build_time = time.perf_counter() - started_at
+
+    def add(self, news_id: int, title: str, news_date: datetime) -> None:
+        """
+        Add a news item or replace its title.
+
+        Args:
+            news_id (int): The ID of the news item.
+            title (str): The title of the news item.
+            news_date (datetime): The publication date of the news item.
+        """
+        self.remove(news_id)
+        self._titles[news_id] = (title, news_date)
+        suffixes = _get_suffixes(title)
+        for suffix in suffixes:
+            insort(self._keys, (suffix, news_id))
+        for prefix in _get_short_prefixes(suffixes):
+            insort(self._recent.setdefault(prefix, []), (news_date, -news_id))
+
+    def remove(self, news_id: int) -> None:
+        """
+        Remove a news item.
+
+        Args:
+            news_id (int): The ID of the news item.
+        """
+        entry = self._titles.pop(news_id, None)
+        if entry is None:
+            return
+
+        suffixes = _get_suffixes(entry[0])
+        for suffix in suffixes:
+            index = bisect_left(self._keys, (suffix, news_id))
+            if index < len(self._keys) and self._keys[index] == (suffix, news_id):
+                del self._keys[index]
+
+        news_key = (entry[1], -news_id)
+        for prefix in _get_short_prefixes(suffixes):
+            entries = self._recent[prefix]
+            index = bisect_left(entries, news_key)
+            if index < len(entries) and entries[index] == news_key:
+                del entries[index]
+            if not entries:
+                del self._recent[prefix]
+
+    def suggest(self, query: str, limit: int) -> list[tuple[int, str]]:
+        """
+        Find news whose title has a word starting with the query.
+
+        Args:
+            query (str): The typed text.
+            limit (int): The number of suggestions to return.
+
+        Returns:
+            list[tuple[int, str]]: (id, title) of the found news,
+                the newest first.
+        """
+        query = normalize_title(query)
+        if not query or limit <= 0:
+            return []
+
+        if len(query) <= SHORT_PREFIX_LENGTH:
+            newest = reversed(self._recent.get(query, [])[-limit:])
+            return [
+                (-news_id, self._titles[-news_id][0]) for _, news_id in newest
+            ]
+
+        # Longer queries match few titles, all of them are ranked
+        found = set()
+        index = bisect_left(self._keys, (query, 0))
+        while index < len(self._keys):
+            suffix, news_id = self._keys[index]
+            if not suffix.startswith(query):
+                break
+            found.add(news_id)
+            index += 1
+
+        results = heapq.nlargest(
+            limit, found, 
+            key=lambda news_id: (self._titles[news_id][1], -news_id)
+        )
+        return [(news_id, self._titles[news_id][0]) for news_id in results]
+
+
+def _get_suffixes(title: str) -> set[str]:
+    words = normalize_title(title).split(" ")
+    return {" ".join(words[i:]) for i in range(len(words)) if words[i]}
+
+
+def _get_short_prefixes(suffixes: set[str]) -> set[str]:
+    return {
+        suffix[:length] for suffix in suffixes 
+        for length in range(1, min(len(suffix), SHORT_PREFIX_LENGTH) + 1)
+    }
+
+
+title_suggestions = TitleSuggestions()
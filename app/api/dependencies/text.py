@@ -0,0 +1,107 @@
+import math
+import re
+
+TAG_PATTERN = re.compile(r"<[^>]+>")
+WORD_PATTERN = re.compile(r"\w+")
+
+# Length of news excerpts in characters
+EXCERPT_LENGTH = 280
+# Average reading speed, words per minute
+WORDS_PER_MINUTE = 200
+
+# Common russian inflection endings, the longest ones first
+ENDINGS = (
+    "ами", "ями", "ого", "его", "ому", "ему", "ыми", "ими",
+    "ой", "ей", "ий", "ый", "ая", "яя", "ое", "ее", "ые", "ие",
+    "ов", "ев", "ах", "ях", "ам", "ям", "ом", "ем", "ую", "юю",
+    "а", "я", "о", "е", "ы", "и", "у", "ю", "ь",
+)
+# Shorter stems are kept whole, so short words and names survive
+MIN_STEM_LENGTH = 4
+
+
+def strip_tags(text: str) -> str:
+    """
+    Remove html tags from a text and collapse its whitespace.
+
+    Args:
+        text (str): The text, may contain html tags.
+
+    Returns:
+        str: The plain text.
+    """
+    return " ".join(TAG_PATTERN.sub(" ", text or "").split())
+
+
+def make_excerpt(content: str, length: int = EXCERPT_LENGTH) -> str:
+    """
+    Make a plain text excerpt of a content, cut on a word boundary.
+
+    Args:
+        content (str): The content, may contain html tags.
+        length (int): The maximum length of the excerpt.
+
+    Returns:
+        str: The excerpt, ends with an ellipsis if the content was cut.
+    """
+    text = strip_tags(content)
+    if len(text) <= length:
+        return text
+
+    excerpt = text[:length - 1]
+    if " " in excerpt:
+        excerpt = excerpt.rsplit(" ", 1)[0]
+    return excerpt.rstrip(",.;:-—") + "…"
+
+
+def get_reading_time(content: str) -> int:
+    """
+    Estimate the reading time of a content.
+
+    Args:
+        content (str): The content, may contain html tags.
+
+    Returns:
+        int: The reading time in minutes, at least one.
+    """
+    words = len(strip_tags(content).split())
+    return max(1, math.ceil(words / WORDS_PER_MINUTE))
+
+
+def stem_word(word: str) -> str:
+    """
+    Cut a common inflection ending off a russian word.
+
+    The stem is not linguistically exact, but the forms of a word
+    usually get the same one ("матча", "матчи" -> "матч").
+
+    Args:
+        word (str): The lowercased word.
+
+    Returns:
+        str: The stem, the word itself if it has no known ending.
+    """
+    for ending in ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query, so its equivalent forms are equal.
+
+    Only meant for cache keys, the stems don't match the lexemes of 
+    the Postgres stemmer.
+
+    Words are lowercased and stemmed, ё is replaced by е and whitespace 
+    is collapsed. Punctuation is kept, it may be a part of the query syntax.
+
+    Args:
+        query (str): The search query.
+
+    Returns:
+        str: The normalized query.
+    """
+    query = " ".join(query.lower().replace("ё", "е").split())
+    return WORD_PATTERN.sub(lambda match: stem_word(match.group()), query)
@@ -0,0 +1,39 @@
+from collections import Counter
+
+
+class ViewCounter:
+    """
+    In-process buffer of view increments.
+
+    Views are only counted in memory on reads, a scheduled job takes
+    the accumulated increments and writes them in one batch, so hot news
+    never lock their rows on every read.
+    """
+
+    def __init__(self):
+        self._pending: Counter[int] = Counter()
+
+    def hit(self, news_id: int) -> None:
+        self._pending[news_id] += 1
+
+    def take(self) -> dict[int, int]:
+        """
+        Take the accumulated increments, the buffer starts over empty.
+
+        Returns:
+            dict[int, int]: Views by news id.
+        """
+        pending, self._pending = self._pending, Counter()
+        return dict(pending)
+
+    def restore(self, views: dict[int, int]) -> None:
+        """
+        Return increments that could not be written to the buffer.
+
+        Args:
+            views (dict[int, int]): Views by news id.
+        """
+        self._pending.update(views)
+
+
+news_views = ViewCounter()
@@ -1,7 +1,9 @@
 from datetime import date, datetime
 from typing import List
 
-from sqlalchemy import Column, ForeignKey, Index, String, Table, func
+from sqlalchemy import (Column, Computed, ForeignKey, Index, String, Table,
+                        func)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.api.dependencies.database import Base, BaseClear
@@ -124,6 +126,22 @@ class News(Base):
     )
     image_url: Mapped[str] = mapped_column(String(256))
     status: Mapped[str] = mapped_column(default=db_constants.NEWS_AVAILABLE)
+    # Precomputed from the content on every write for the news lists
+    excerpt: Mapped[str] = mapped_column(String(512), server_default="")
+    reading_time: Mapped[int] = mapped_column(server_default="1")
+    # Total views, increments are buffered in memory and flushed in batches
+    views: Mapped[int] = mapped_column(server_default="0")
+    # Full-text search document, the title outweighs the content.
+    # Deferred, so it is never loaded with the news
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(content, '')), 'B')",
+            persisted=True
+        ),
+        deferred=True
+    )
     
     news_actions: Mapped["NewsAction"] = relationship(
         back_populates="news", cascade="all, delete-orphan"
@@ -145,6 +163,33 @@ class NewsAction(Base):
     news: Mapped["News"] = relationship(
         back_populates="news_actions"
     )
+
+
+class NewsRelated(BaseClear):
+    __tablename__ = "news_related"
+    
+    # Precomputed "read also" list of a news item
+    news_id: Mapped[int] = mapped_column(
+        ForeignKey("news.id", ondelete="CASCADE", onupdate="CASCADE"), 
+        primary_key=True
+    )
+    related_id: Mapped[int] = mapped_column(
+        ForeignKey("news.id", ondelete="CASCADE", onupdate="CASCADE"), 
+        primary_key=True
+    )
+    score: Mapped[float]
+    
+
+class NewsViews(BaseClear):
+    __tablename__ = "news_views"
+    
+    # Views of a news item per day, for the most read news of a period
+    news_id: Mapped[int] = mapped_column(
+        ForeignKey("news.id", ondelete="CASCADE", onupdate="CASCADE"), 
+        primary_key=True
+    )
+    day: Mapped[date] = mapped_column(primary_key=True)
+    views: Mapped[int]
     
 
 class Permission(BaseClear):
@@ -235,6 +280,11 @@ class Event(Base):
     first_team_score: Mapped[int] = mapped_column(server_default="0")
     second_team_score: Mapped[int] = mapped_column(server_default="0")
     stream_url: Mapped[str] = mapped_column(String(256), nullable=True)
+    # Incremented by every update, concurrent updates of a score
+    # made from the same version conflict instead of overwriting each other
+    version: Mapped[int] = mapped_column(server_default="1")
+    
+    __mapper_args__ = {"version_id_col": version}
     
     first_team: Mapped["Team"] = relationship(lazy="selectin", 
                                               foreign_keys=[first_team_id])
@@ -282,4 +332,37 @@ class StoreCategory(BaseClear):
 Index(
     'ix_title_content', News.title, News.content, postgresql_using='gin',
     postgresql_ops={'title': 'gin_trgm_ops', 'content': 'gin_trgm_ops'}
-)
\ No newline at end of file
+)
+Index('ix_news_search_vector', News.search_vector, postgresql_using='gin')
+
+# Matches the (news_date DESC, id ASC) ordering of the news listings
+# for both available and unavailable news
+Index(
+    'ix_news_status_news_date_id', News.status, News.news_date.desc(), News.id
+)
+
+
+# Backs the expired news lookup of delete_expired_news
+Index('ix_news_actions_type_created_at', NewsAction.type, NewsAction.created_at)
+# Backs the cascade delete of actions when news are deleted
+Index('ix_news_actions_news_id', NewsAction.news_id)
+
+# Related news of an item are read in the order of their score
+Index('ix_news_related_news_id_score', NewsRelated.news_id, NewsRelated.score.desc())
+# Backs the cascade delete of related lists pointing to a deleted news item
+Index('ix_news_related_related_id', NewsRelated.related_id)
+
+# Backs the most read news lookup of the last days
+Index('ix_news_views_day', NewsViews.day)
+
+# Back the date filters and orderings of the events lists
+Index('ix_events_start_date', Event.start_date)
+Index('ix_events_end_date', Event.end_date)
+# The current event lookup, only events without an end date
+Index(
+    'ix_events_current_start_date', Event.start_date, 
+    postgresql_where=Event.end_date.is_(None)
+)
+# Back the opponent filter and the RESTRICT checks of deleted teams
+Index('ix_events_first_team_id', Event.first_team_id)
+Index('ix_events_second_team_id', Event.second_team_id)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, Field, model_validator
 
 from app.api.schemas.team import EventTeam
 
@@ -37,7 +37,27 @@ class Event(EventBase):
     second_team: EventTeam
     location_name: Optional[str]
     location_address: Optional[str]
+    version: int
     
     
 class EditEvent(CreateEvent):
-    id: int
\ No newline at end of file
+    id: int
+
+
+class EditEventScore(BaseModel):
+    first_team_score: int = Field(ge=0)
+    second_team_score: int = Field(ge=0)
+    # The version the score was changed from
+    version: int
+
+
+class EventScore(BaseModel):
+    id: int
+    first_team_score: int
+    second_team_score: int
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    version: int
+    
+    class Config:
+        from_attributes=True
\ No newline at end of file
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+from app.api.schemas.event import Event
+from app.api.schemas.member import TeamList
+from app.api.schemas.news import NewsPreview
+from app.api.schemas.store import StoreItem
+
+
+class Home(BaseModel):
+    news: list[NewsPreview]
+    events: list[Event]
+    team: TeamList
+    store_items: list[StoreItem]
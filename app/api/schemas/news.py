@@ -20,4 +20,75 @@ class News(BaseNews):
     id: int
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NewsPreview(BaseModel):
+    # News in lists, without the content
+    id: int
+    title: str
+    news_date: datetime
+    category_name: str
+    image_url: Optional[str] = "url"
+    excerpt: str
+    reading_time: int
+    
+    class Config:
+        from_attributes = True
+
+
+class NewsSearchResult(NewsPreview):
+    # Highlighted fragments of the content, only set for search results
+    snippet: Optional[str] = None
+
+
+class NewsBatch(BaseModel):
+    # Found news in the requested order
+    items: list[News]
+    missing: list[int]
+
+
+class PopularNews(NewsPreview):
+    # Views in the requested period
+    views: int
+
+
+class NewsSuggestion(BaseModel):
+    id: int
+    title: str
+
+
+class NewsPage(BaseModel):
+    items: list[NewsPreview]
+    next_cursor: Optional[str] = None
+
+
+
+class MonthFacet(BaseModel):
+    month: int
+    count: int
+
+
+class YearFacet(BaseModel):
+    year: int
+    count: int
+    months: list[MonthFacet]
+
+
+class CategoryFacet(BaseModel):
+    category_name: str
+    count: int
+
+
+class NewsFacets(BaseModel):
+    years: list[YearFacet]
+    categories: list[CategoryFacet]
+
+
+class NewsImportError(BaseModel):
+    line: int
+    detail: str
+
+
+class NewsImportReport(BaseModel):
+    imported: int
+    errors: list[NewsImportError]
\ No newline at end of file
@@ -1,14 +1,23 @@
+import asyncio
+from datetime import datetime
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.api import models
 from app.api.cruds import event as crud
 from app.api.cruds import location as l_crud
 from app.api.cruds import team as t_crud
+from app.api.dependencies.cache import MISSING, ResponseCache, events_version
 from app.api.dependencies.enums import EventPages
+from app.api.dependencies.live import get_score_message, live_broker
 from app.api.dependencies.exceptions import (EventNotFound,
+                                             EventVersionConflict,
                                              InternalServerError,
                                              LocationNotFound, TeamNotFound)
-from app.api.schemas.event import CreateEvent, EditEvent, Event
+from app.api.schemas.event import (CreateEvent, EditEvent, EditEventScore,
+                                   Event, EventScore)
 from app.api.schemas.team import EventTeam
 from app.api.schemas.user import User
 from app.api.services import locations_service, teams_service
@@ -16,6 +25,17 @@ from app.api.services.users_service import check_user_permission
 from app.config import transactions
 from app.logger import logger
 
+# Number of events on the main page
+MAIN_PAGE_EVENTS = 4
+# Maximum seconds to keep the main page events, they are kept until 
+# the next start or end of an event and event writes invalidate them
+MAIN_PAGE_CACHE_TTL = 3600
+
+# Seconds between keepalive messages of idle live streams
+LIVE_KEEPALIVE_INTERVAL = 15
+
+events_cache = ResponseCache(ttl=MAIN_PAGE_CACHE_TTL, version=events_version)
+
 
 async def create_event(db: AsyncSession, event: CreateEvent, 
                        current_user: User) -> Event:
@@ -49,46 +69,14 @@ async def get_all_events(db: AsyncSession, limit: int,
                          month: int | None) -> list[Event]:
     try:
         if page == EventPages.MAIN:
-            current_event = await crud.get_current_event(db)
-            
-            future_limit = 1 if current_event else 2
-            future_events = await crud.get_future_events(
-                db, limit=future_limit, offset=0
-            )
-            
-            finished_limit = (2 - len(future_events) + future_limit) \
-                if future_events else 2 + future_limit
-            
-            finished_events = await crud.get_finished_events(
-                db, limit=finished_limit, offset=0
-            )
-            
-            events = []
-            if current_event is not None:
-                events.append(await validate_event_model(current_event))
-            
-            if future_events:
-                events.extend(
-                    [await validate_event_model(event) for event in future_events]
-                )
-             
-            if finished_events:   
-                events.extend(
-                    [await validate_event_model(event) for event in finished_events]
-                )
+            events = await get_main_page_events(db)
 
         elif page == EventPages.EVENT:
-            events_objs = await crud.get_all_events(
+            rows = await crud.get_all_events(
                 db, limit=limit, offset=offset, opponent_id=opponent_id,
                 year=year, month=month
             )
-            
-            if len(events_objs):
-                events = [
-                    await validate_event_model(event) for event in events_objs
-                ]
-            else:
-                events = []
+            events = serialize_event_rows(rows)
         
         else:
             events = []
@@ -100,6 +88,46 @@ async def get_all_events(db: AsyncSession, limit: int,
         
 
 
+async def get_main_page_events(db: AsyncSession) -> list[Event]:
+    key = events_cache.make_key("main_page_events")
+    cached = events_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    now = datetime.now()
+    result = await crud.get_main_page_events(
+        db, now=now, size=MAIN_PAGE_EVENTS
+    )
+    if result is None:
+        raise InternalServerError
+    
+    candidates, next_boundary = result
+    groups = {
+        crud.CURRENT_EVENTS: [], crud.FUTURE_EVENTS: [], 
+        crud.FINISHED_EVENTS: []
+    }
+    for row in candidates:
+        groups[row.group].append(row)
+    
+    # The current event, one or two future events (two if nothing is 
+    # going on now), the rest of the page is filled with finished events
+    current_events = groups[crud.CURRENT_EVENTS]
+    future_events = groups[crud.FUTURE_EVENTS][:1 if current_events else 2]
+    finished_limit = MAIN_PAGE_EVENTS - len(current_events) - len(future_events)
+    finished_events = groups[crud.FINISHED_EVENTS][:finished_limit]
+    
+    events = serialize_event_rows(
+        current_events + future_events + finished_events
+    )
+    
+    # The selection changes when the next event starts or ends
+    ttl = MAIN_PAGE_CACHE_TTL
+    if next_boundary is not None:
+        ttl = min(ttl, max(0, (next_boundary - now).total_seconds()))
+    events_cache.set(key, events, ttl=ttl)
+    return events
+
+
 async def edit_event(db: AsyncSession, event: EditEvent, 
                      current_user: User) -> Event:
     await check_user_permission(current_user, transactions.EDIT_EVENT)
@@ -136,11 +164,35 @@ async def edit_event(db: AsyncSession, event: EditEvent,
         event = await validate_event_model(event_obj)
         
         return event
+    except StaleDataError:
+        # The score was changed after the event was loaded
+        raise EventVersionConflict
     except Exception as err:
         logger.error(err, exc_info=True)
         raise InternalServerError
 
 
+async def edit_event_score(db: AsyncSession, event_id: int, 
+                           score: EditEventScore, 
+                           current_user: User) -> EventScore:
+    await check_user_permission(current_user, transactions.EDIT_EVENT)
+    
+    try:
+        event = await crud.edit_event_score(
+            db, event_id=event_id, **score.model_dump()
+        )
+    except Exception as err:
+        logger.error(err, exc_info=True)
+        raise InternalServerError
+    if event is not None:
+        return EventScore.model_validate(event)
+    
+    # Only a failed update pays for the lookup
+    if await crud.get_event_by_id(db, event_id=event_id) is None:
+        raise EventNotFound
+    raise EventVersionConflict
+
+
 async def delete_event(db: AsyncSession, event_id: int, current_user: User):
     await check_user_permission(current_user, transactions.DELETE_EVENT)
     
@@ -150,6 +202,8 @@ async def delete_event(db: AsyncSession, event_id: int, current_user: User):
     
     try:
         await crud.delete_event(db, event=event_obj)
+    except StaleDataError:
+        raise EventVersionConflict
     except Exception as err:
         logger.error(err, exc_info=True)
     
@@ -162,6 +216,33 @@ async def get_event_by_id(db: AsyncSession, event_id: int):
     return await validate_event_model(event_obj)
 
 
+def serialize_event_rows(rows: list) -> list[Event]:
+    """
+    Build events from the flat rows of crud.select_event_rows in one pass.
+    
+    The rows come straight from the database, so the models are 
+    constructed without validation.
+    """
+    return [
+        Event.model_construct(
+            id=row.id, league=row.league, tour=row.tour, 
+            start_date=row.start_date, end_date=row.end_date, 
+            stream_url=row.stream_url, version=row.version,
+            first_team=EventTeam.model_construct(
+                id=row.first_team_id, name=row.first_team_name, 
+                logo_url=row.first_team_logo_url, score=row.first_team_score
+            ),
+            second_team=EventTeam.model_construct(
+                id=row.second_team_id, name=row.second_team_name, 
+                logo_url=row.second_team_logo_url, score=row.second_team_score
+            ),
+            location_name=row.location_name, 
+            location_address=row.location_address
+        )
+        for row in rows
+    ]
+
+
 async def validate_event_model(event: models.Event) -> Event:
     try:
         first_team = EventTeam.model_validate(event.first_team)
@@ -172,12 +253,53 @@ async def validate_event_model(event: models.Event) -> Event:
         validated_event = Event(
             id=event.id, league=event.league, tour=event.tour, 
             start_date=event.start_date, end_date=event.end_date, 
+            stream_url=event.stream_url,
             first_team=first_team, second_team=second_team,
             location_name=event.location.name if event.location else None,
-            location_address=event.location.address if event.location else None
+            location_address=event.location.address if event.location else None,
+            version=event.version
         )
         
         return validated_event
     except Exception as err:
         logger.error(err)
-        raise InternalServerError
\ No newline at end of file
+        raise InternalServerError
+
+
+async def get_event_live_updates(db: AsyncSession, 
+                                 event_id: int) -> AsyncIterator[str | None]:
+    """
+    Get the current state of an event, then its live updates.
+    
+    Yields None when nothing happened for LIVE_KEEPALIVE_INTERVAL, 
+    so the caller can keep the connection alive. Ends if the subscriber
+    falls too far behind.
+    """
+    event = await crud.get_event_by_id(db, event_id=event_id)
+    if event is None:
+        raise EventNotFound
+    
+    # Subscribed before the first message, so no update is lost
+    queue = live_broker.subscribe(event_id)
+    return _iterate_live_updates(event_id, get_score_message(event), queue)
+
+
+async def _iterate_live_updates(event_id: int, current: str, 
+                                queue: asyncio.Queue) -> AsyncIterator[str | None]:
+    try:
+        yield current
+        while True:
+            try:
+                message = await asyncio.wait_for(
+                    queue.get(), timeout=LIVE_KEEPALIVE_INTERVAL
+                )
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            
+            if message is None:
+                # Dropped as a slow consumer
+                return
+            yield message
+    finally:
+        live_broker.unsubscribe(event_id, queue)
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.api.dependencies.cache import MISSING, ResponseCache
+from app.api.dependencies.database import SessionLocal
+from app.api.dependencies.enums import StoreItemFilters
+from app.api.schemas.home import Home
+from app.api.services import (events_service, members_service, news_service,
+                              store_service)
+
+# Number of items of the homepage sections
+HOME_NEWS_SIZE = 6
+HOME_STORE_ITEMS_SIZE = 4
+
+# Seconds to keep the sections, the roster changes rarely.
+# News and events are cached by their services and invalidated by writes
+TEAM_CACHE_TTL = 600
+STORE_CACHE_TTL = 300
+
+home_cache = ResponseCache(ttl=STORE_CACHE_TTL)
+
+
+async def get_home() -> Home:
+    # Every section runs on its own pooled session, so the sections
+    # are loaded concurrently and the slowest one bounds the response time
+    news, events, team, store_items = await asyncio.gather(
+        _get_news(), _get_events(), _get_team(), _get_store_items()
+    )
+    return Home(news=news, events=events, team=team, store_items=store_items)
+
+
+async def _get_news():
+    async with SessionLocal() as db:
+        return await news_service.get_all_news(
+            db, limit=HOME_NEWS_SIZE, offset=0, year=None, month=None, 
+            category=None, search=None
+        )
+
+
+async def _get_events():
+    async with SessionLocal() as db:
+        return await events_service.get_main_page_events(db)
+
+
+async def _get_team():
+    key = home_cache.make_key("team")
+    cached = home_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    async with SessionLocal() as db:
+        team = await members_service.get_all_active_team_members(db)
+    home_cache.set(key, team, ttl=TEAM_CACHE_TTL)
+    return team
+
+
+async def _get_store_items():
+    key = home_cache.make_key("store_items")
+    cached = home_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    async with SessionLocal() as db:
+        store_items = await store_service.get_all_store_items(
+            db, limit=HOME_STORE_ITEMS_SIZE, offset=0, 
+            filter=StoreItemFilters.NEW, category=None
+        )
+    home_cache.set(key, store_items, ttl=STORE_CACHE_TTL)
+    return store_items
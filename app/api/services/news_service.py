@@ -1,44 +1,296 @@
+import csv
+import io
+import json
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator
+
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api import models
 from app.api.cruds import news as crud
-from app.api.dependencies.exceptions import CategoryNotFound, NewsNotFound
-from app.api.schemas.news import News
+from app.api.dependencies.cache import MISSING, ResponseCache, news_version
+from app.api.dependencies.cleaner import (schedule_feeds_refresh,
+                                          schedule_news_publication,
+                                          schedule_related_news_update,
+                                          unschedule_news_publication)
+from app.api.dependencies.conditional import make_etag
+from app.api.dependencies.cursor import decode_cursor, encode_cursor
+from app.api.dependencies.database import ExportSessionLocal
+from app.api.dependencies.enums import ExportFormats
+from app.api.dependencies.exceptions import (CategoryNotFound, InvalidNewsIds,
+                                             NewsNotFound)
+from app.api.dependencies.news_index import news_index
+from app.api.dependencies.suggestions import title_suggestions
+from app.api.dependencies.text import normalize_query
+from app.api.dependencies.views import news_views
+from app.api.schemas.news import (CategoryFacet, CreateNews, MonthFacet,
+                                  News, NewsBatch, NewsFacets, NewsImportError,
+                                  NewsImportReport, NewsPage, NewsPreview,
+                                  NewsSearchResult, NewsSuggestion,
+                                  PopularNews, YearFacet)
 from app.api.schemas.user import User
 from app.api.services.users_service import check_user_permission
 from app.config import db_constants, transactions
+from app.logger import logger
+
+# Seconds to keep public news responses, writes invalidate them earlier
+NEWS_CACHE_TTL = 60
+# Number of news inserted by one statement during an import
+IMPORT_BATCH_SIZE = 500
+# Maximum number of news requested by one batch request
+MAX_BATCH_SIZE = 50
+# Maximum number of title suggestions per request
+MAX_SUGGESTIONS = 10
+# Days of views counted by the most read news
+MOST_READ_DAYS = 7
+# Seconds to keep the most read news, views are flushed every few seconds
+MOST_READ_CACHE_TTL = 300
+
+# Seconds to keep search results and the number of cached queries,
+# search traffic is skewed to a few popular queries after matches
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_SIZE = 4096
+
+news_cache = ResponseCache(ttl=NEWS_CACHE_TTL, version=news_version)
+search_cache = ResponseCache(
+    ttl=SEARCH_CACHE_TTL, maxsize=SEARCH_CACHE_SIZE, version=news_version
+)
 
 
 async def get_news(db: AsyncSession, news_id: int) -> News:
+    key = news_cache.make_key("news", news_id=news_id)
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
     news = await crud.get_news_by_id(db, news_id=news_id)
+    if not _is_visible(news):
+        raise NewsNotFound
+    
+    news = News.model_validate(news)
+    news_cache.set(key, news)
+    return news
+
+
+async def get_news_batch(db: AsyncSession, ids: str) -> NewsBatch:
+    try:
+        # Duplicates are dropped, the order is kept
+        news_ids = list(dict.fromkeys(
+            int(news_id) for news_id in ids.split(",") if news_id.strip()
+        ))
+    except ValueError:
+        raise InvalidNewsIds
+    
+    if not news_ids or len(news_ids) > MAX_BATCH_SIZE:
+        raise InvalidNewsIds
+    
+    news = await crud.get_news_by_ids(db, news_ids=news_ids) or []
+    news = [News.model_validate(news_) for news_ in news if _is_visible(news_)]
     
-    if news is None or news.status == db_constants.NEWS_UNAVAILABLE:
+    found = {news_.id for news_ in news}
+    return NewsBatch(
+        items=news, 
+        missing=[news_id for news_id in news_ids if news_id not in found]
+    )
+
+
+async def get_news_validators(db: AsyncSession, 
+                              news_id: int) -> tuple[str, datetime]:
+    """
+    Get the ETag and Last-Modified of a news item without loading it.
+    """
+    key = news_cache.make_key("news_validators", news_id=news_id)
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    news = await crud.get_news_updated_at(db, news_id=news_id)
+    if not _is_visible(news):
         raise NewsNotFound
     
-    return News.model_validate(news)
+    validators = (make_etag("news", news_id, news.updated_at), news.updated_at)
+    news_cache.set(key, validators)
+    return validators
+
+
+async def get_related_news(db: AsyncSession, news_id: int) -> list[NewsPreview]:
+    key = news_cache.make_key("related_news", news_id=news_id)
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    result = await crud.get_related_news(db, news_id=news_id)
+    if result is None or result[0] != db_constants.NEWS_AVAILABLE:
+        # Deleted and not yet published news are hidden
+        raise NewsNotFound
+    
+    related = result[1]
+    if not related:
+        # Not computed yet, e.g. the news item was imported. Computed off 
+        # the request, the empty list is cached only for NEWS_CACHE_TTL,
+        # so the computed one is served next and a news item without
+        # related news is recomputed at most once per TTL
+        schedule_related_news_update(news_id)
+    
+    related = [NewsPreview.model_validate(news_) for news_ in related]
+    news_cache.set(key, related)
+    return related
+
+
+def count_news_view(news_id: int):
+    # Buffered, written in batches by the flush_news_views job
+    news_views.hit(news_id)
+
+
+async def get_most_read_news(db: AsyncSession, limit: int) -> list[PopularNews]:
+    key = news_cache.make_key("most_read_news", limit=limit)
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    since = date.today() - timedelta(days=MOST_READ_DAYS - 1)
+    news = await crud.get_most_read_news(db, since=since, limit=limit)
+    news = [
+        PopularNews(**NewsPreview.model_validate(news_).model_dump(), views=views)
+        for news_, views in news or []
+    ]
+    news_cache.set(key, news, ttl=MOST_READ_CACHE_TTL)
+    return news
+
+
+def suggest_news(query: str, limit: int) -> list[NewsSuggestion]:
+    # Served from memory, neither the database nor the contents are touched
+    suggestions = title_suggestions.suggest(
+        query, limit=max(0, min(limit, MAX_SUGGESTIONS))
+    )
+    return [
+        NewsSuggestion(id=news_id, title=title) 
+        for news_id, title in suggestions
+    ]
+
+
+async def get_all_news_validators(db: AsyncSession, limit: int, offset: int, 
+                                  year: int | None, month: int | None, 
+                                  category: str | None, 
+                                  cursor: str | None) -> tuple[str, datetime | None]:
+    """
+    Get the ETag and Last-Modified of a news feed page.
+    
+    The page changes only if a news item matching the filters is changed,
+    added or removed, so the max updated_at and the count of the matching
+    news together with the params identify its version.
+    """
+    key = news_cache.make_key(
+        "all_news_validators", limit=limit, offset=offset, year=year, 
+        month=month, category=category, cursor=cursor
+    )
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    last_modified, count = await crud.get_all_news_updated_at(
+        db, year=year, month=month, category=category
+    )
+    etag = make_etag(
+        "all_news", limit, offset, year, month, category, cursor, 
+        last_modified, count
+    )
+    validators = (etag, last_modified)
+    news_cache.set(key, validators)
+    return validators
 
 
 async def get_all_news(db: AsyncSession, limit: int, offset: int, 
                        year: int | None, month: int | None, search: str | None,
-                       category: str | None) -> list[News]:
+                       category: str | None, 
+                       cursor: str | None = None) -> list[NewsPreview] | NewsPage:
+    # Equivalent forms of a query share the cached results. The normalized 
+    # query is only the key, the searched text is not stemmed here, 
+    # Postgres stems it the same way as the documents
+    search = " ".join(search.lower().split()) if search else None
+    cache = search_cache if search else news_cache
+    key = cache.make_key(
+        "all_news", limit=limit, offset=offset, year=year, month=month, 
+        search=normalize_query(search) if search else None, 
+        category=category, cursor=cursor
+    )
+    # Concurrent identical misses share one query
+    return await cache.get_or_load(
+        key, lambda: _get_all_news(
+            db, limit=limit, offset=offset, year=year, month=month, 
+            search=search, category=category, cursor=cursor
+        )
+    )
+
+
+async def _get_all_news(db: AsyncSession, limit: int, offset: int, 
+                        year: int | None, month: int | None, 
+                        search: str | None, category: str | None, 
+                        cursor: str | None) -> list[NewsPreview] | NewsPage:
+    if search and news_index.enabled:
+        news_ids = news_index.search(
+            search, limit=limit, offset=offset, year=year, month=month, 
+            category=category
+        )
+        if not news_ids:
+            return []
+        
+        news = await crud.get_news_by_ids(
+            db, news_ids=news_ids, load_content=False
+        )
+        return [NewsSearchResult.model_validate(news_) for news_ in news]
+    
+    if search:
+        # Search results are ordered by relevance, 
+        # so they are always paged by offset
+        found = await crud.search_news(
+            db, search=search, limit=limit, offset=offset, year=year, 
+            month=month, category=category
+        )
+        results = []
+        for news_, snippet in found:
+            result = NewsSearchResult.model_validate(news_)
+            result.snippet = snippet
+            results.append(result)
+        return results
+    
+    if cursor is None:
+        news = await crud.get_all_news(
+            db, limit=limit, offset=offset, year=year, month=month, 
+            category=category
+        )
+        news = [NewsPreview.model_validate(news_) for news_ in news]
+        return news
+    
+    # Cursor mode: an empty cursor requests the first page.
+    # One extra row is fetched to know whether there is a next page
     news = await crud.get_all_news(
-        db, limit=limit, offset=offset, year=year, month=month, 
-        category=category, search=search
+        db, limit=limit + 1, offset=0, year=year, month=month, 
+        category=category, cursor=decode_cursor(cursor) if cursor else None
+    )
+    next_cursor = None
+    if len(news) > limit:
+        news = news[:limit]
+        next_cursor = encode_cursor(news[-1].news_date, news[-1].id)
+    
+    return NewsPage(
+        items=[NewsPreview.model_validate(news_) for news_ in news],
+        next_cursor=next_cursor
     )
-    news = [News.model_validate(news_) for news_ in news]
-    return news
 
 
 async def get_all_deleted_news(db: AsyncSession,  limit: int, offset: int, 
                                year: int | None, month: int | None,
                                category: str | None,
-                               current_user: User) -> list[News]:
+                               current_user: User) -> list[NewsPreview]:
     await check_user_permission(current_user, transactions.VIEW_DELETED_NEWS)
     
     news = await crud.get_all_deleted_news(
         db, limit=limit, offset=offset, year=year, month=month,
         category=category
     )
-    news = [News.model_validate(news_) for news_ in news]
+    news = [NewsPreview.model_validate(news_) for news_ in news]
     return news
 
 
@@ -52,17 +304,180 @@ async def create_news(db: AsyncSession, news: News, current_user: User) -> News:
     news = await crud.add_news(
         db, user_id=current_user.id, **news.model_dump(exclude=["id"])
     )
+    _index_news(news)
+    _schedule_news(news)
+    schedule_feeds_refresh()
+    schedule_related_news_update(news.id)
     return News.model_validate(news)
     
 
+async def import_news(db: AsyncSession, lines: AsyncIterator[bytes],
+                      current_user: User) -> NewsImportReport:
+    await check_user_permission(current_user, transactions.CREATE_NEWS)
+    
+    categories = await crud.get_all_news_categories(db)
+    categories = {category.name for category in categories}
+    
+    report = NewsImportReport(imported=0, errors=[])
+    # (line number, news) waiting to be inserted
+    batch: list[tuple[int, CreateNews]] = []
+    
+    line_number = 0
+    async for line in _split_lines(lines):
+        line_number += 1
+        if not line.strip():
+            continue
+        
+        try:
+            news = CreateNews.model_validate_json(line)
+        except ValidationError as err:
+            report.errors.append(NewsImportError(
+                line=line_number, 
+                detail="; ".join(error["msg"] for error in err.errors())
+            ))
+            continue
+        
+        if news.category_name not in categories:
+            report.errors.append(NewsImportError(
+                line=line_number, detail=CategoryNotFound().detail
+            ))
+            continue
+        
+        detail = _check_news_columns(news)
+        if detail is not None:
+            report.errors.append(NewsImportError(
+                line=line_number, detail=detail
+            ))
+            continue
+        
+        batch.append((line_number, news))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await _import_batch(db, batch, report, current_user=current_user)
+            batch = []
+    
+    if batch:
+        await _import_batch(db, batch, report, current_user=current_user)
+    
+    if report.imported:
+        schedule_feeds_refresh()
+    return report
+
+
+def _check_news_columns(news: CreateNews) -> str | None:
+    # Catches what the schema allows but the table doesn't, 
+    # so one such line doesn't fail its whole batch
+    columns = models.News.__table__.columns
+    for field, value in news.model_dump().items():
+        column = columns[field]
+        if value is None:
+            if not column.nullable:
+                return f"{field}: обязательное поле"
+        elif isinstance(value, str):
+            length = getattr(column.type, "length", None)
+            if length is not None and len(value) > length:
+                return f"{field}: длиннее {length} символов"
+    return None
+
+
+async def _import_batch(db: AsyncSession, batch: list[tuple[int, CreateNews]],
+                        report: NewsImportReport, current_user: User):
+    added = await crud.add_news_bulk(
+        db, user_id=current_user.id, 
+        news=[news.model_dump() for _, news in batch]
+    )
+    if added is None:
+        # The batch is one transaction, none of its lines were imported.
+        # Its lines are retried one by one, so only the failing ones 
+        # are reported
+        await db.rollback()
+        added = []
+        for line_number, news in batch:
+            row = await crud.add_news_bulk(
+                db, user_id=current_user.id, news=[news.model_dump()]
+            )
+            if row is None:
+                await db.rollback()
+                report.errors.append(NewsImportError(
+                    line=line_number, detail="Не удалось сохранить"
+                ))
+            else:
+                added.extend(row)
+    
+    for news in added:
+        _index_news(news)
+        _schedule_news(news)
+    report.imported += len(added)
+
+
+async def _split_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    
+    if buffer:
+        yield buffer
+
+
+async def export_news(format: ExportFormats, 
+                      current_user: User) -> AsyncIterator[bytes]:
+    # The export includes deleted news
+    await check_user_permission(current_user, transactions.VIEW_DELETED_NEWS)
+    
+    if format == ExportFormats.CSV:
+        return _export_news_csv()
+    return _export_news_ndjson()
+
+
+async def _export_news_ndjson() -> AsyncIterator[bytes]:
+    async with ExportSessionLocal() as db:
+        try:
+            async for row in crud.stream_news_with_actions(db):
+                yield (
+                    json.dumps(row._asdict(), ensure_ascii=False, default=str) 
+                    + "\n"
+                ).encode()
+        except Exception as err:
+            logger.error(err, exc_info=True)
+            raise
+
+
+async def _export_news_csv() -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = None
+    
+    async with ExportSessionLocal() as db:
+        try:
+            async for row in crud.stream_news_with_actions(db):
+                if writer is None:
+                    writer = csv.writer(buffer)
+                    writer.writerow(row._fields)
+                writer.writerow(row)
+                
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+        except Exception as err:
+            logger.error(err, exc_info=True)
+            raise
+
+
 async def delete_news(db: AsyncSession, news_id: int, current_user: User):
-    check_user_permission(current_user, transactions.DELETE_NEWS)
+    await check_user_permission(current_user, transactions.DELETE_NEWS)
     
     news = await crud.get_news_by_id(db, news_id=news_id)
     if news is None:
         raise NewsNotFound
     
+    if news_index.enabled:
+        news_index.remove(news.id, title=news.title, content=news.content)
+    title_suggestions.remove(news.id)
+    
     await crud.delete_news(db, user_id=current_user.id, news=news)
+    unschedule_news_publication(news_id)
+    schedule_feeds_refresh()
     
 
 async def update_news(db: AsyncSession, news: News, current_user: User) -> News:
@@ -76,16 +491,70 @@ async def update_news(db: AsyncSession, news: News, current_user: User) -> News:
     if category is None:
         raise CategoryNotFound
     
+    if news_index.enabled:
+        # The indexed text is about to be overwritten on the object
+        news_index.remove(
+            old_news.id, title=old_news.title, content=old_news.content
+        )
+    
     news = await crud.update_news(
         db, user_id=current_user.id, news=old_news, 
         **news.model_dump(exclude=["id"])
     )
-    return news.model_validate(news)
+    _index_news(news)
+    _schedule_news(news)
+    schedule_feeds_refresh()
+    schedule_related_news_update(news.id)
+    return News.model_validate(news)
 
 
 async def get_all_categories(db: AsyncSession) -> list[str]:
+    key = news_cache.make_key("categories")
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
     categories = await crud.get_all_news_categories(db)
-    return [categorie.name for categorie in categories]
+    categories = [categorie.name for categorie in categories]
+    news_cache.set(key, categories)
+    return categories
+
+
+async def get_news_facets(db: AsyncSession) -> NewsFacets:
+    key = news_cache.make_key("facets")
+    cached = news_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    
+    rows = await crud.get_news_facets(db)
+    
+    years: dict[int, dict[int, int]] = {}
+    categories: dict[str, int] = {}
+    for year, month, category_name, count in rows:
+        months = years.setdefault(int(year), {})
+        months[int(month)] = months.get(int(month), 0) + count
+        categories[category_name] = categories.get(category_name, 0) + count
+    
+    facets = NewsFacets(
+        years=[
+            YearFacet(
+                year=year, count=sum(months.values()),
+                months=[
+                    MonthFacet(month=month, count=count) 
+                    for month, count in sorted(months.items(), reverse=True)
+                ]
+            )
+            for year, months in sorted(years.items(), reverse=True)
+        ],
+        categories=[
+            CategoryFacet(category_name=category_name, count=count)
+            for category_name, count in sorted(
+                categories.items(), key=lambda item: item[1], reverse=True
+            )
+        ]
+    )
+    news_cache.set(key, facets)
+    return facets
 
 
 async def get_deleted_news(db: AsyncSession, news_id: int, 
@@ -102,12 +571,38 @@ async def get_deleted_news(db: AsyncSession, news_id: int,
 async def get_all_scheduled_news(db: AsyncSession, limit: int, offset: int, 
                                  year: int | None, month: int | None,
                                  category: str | None,
-                                 current_user: User) -> list[News]:
+                                 current_user: User) -> list[NewsPreview]:
     await check_user_permission(current_user, transactions.VIEW_SHEDULED_NEWS)
     
     news = await crud.get_all_scheduled_news(
         db, limit=limit, offset=offset, year=year, month=month, 
         category=category
     )
-    news = [News.model_validate(news_) for news_ in news]
-    return news
\ No newline at end of file
+    news = [NewsPreview.model_validate(news_) for news_ in news]
+    return news
+
+
+def _is_visible(news) -> bool:
+    # Deleted and not yet published news are hidden
+    return news is not None and news.status == db_constants.NEWS_AVAILABLE
+
+
+def _index_news(news: models.News):
+    if news.status != db_constants.NEWS_AVAILABLE:
+        # Edited into a scheduled or a deleted one
+        title_suggestions.remove(news.id)
+        return
+    
+    title_suggestions.add(news.id, title=news.title, news_date=news.news_date)
+    if news_index.enabled:
+        news_index.add(
+            news.id, title=news.title, content=news.content, 
+            news_date=news.news_date, category_name=news.category_name
+        )
+
+
+def _schedule_news(news: models.News):
+    if news.status == db_constants.NEWS_SCHEDULED:
+        schedule_news_publication(news.id, news_date=news.news_date)
+    else:
+        unschedule_news_publication(news.id)
\ No newline at end of file
@@ -12,6 +12,12 @@ class Settings(BaseSettings):
     ACCESS_SECRET_KEY: str
     REFRESH_SECRET_KEY: str
     IMAGES_PATH: str
+    # Answer news search from the in-memory index instead of the database
+    NEWS_SEARCH_INDEX: bool = False
+    # Public address of the site, news links of the feeds point to it
+    SITE_URL: str = ""
+    # Carry live event updates between workers with Postgres LISTEN/NOTIFY
+    EVENTS_LIVE_BRIDGE: bool = False
     model_config = SettingsConfigDict(
         env_file=os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
     )
@@ -88,6 +94,8 @@ class DBConstants:
     # Availability of news (if new was deleted, than it has NEWS_UNAVAILABLE)
     NEWS_AVAILABLE = "available"
     NEWS_UNAVAILABLE = "unavailable"
+    # News with a future news_date, it becomes NEWS_AVAILABLE at that date
+    NEWS_SCHEDULED = "scheduled"
     
     # Name of base settings in table base_settings
     BASE_ROLE = "BASE_ROLE_ID"
@@ -8,6 +8,7 @@ from app.api.controllers.auth_controller import app as auth_controller
 from app.api.controllers.events_controller import app as events_controller
 from app.api.controllers.files_controller import app as files_controller
 from app.api.controllers.health_controller import app as health_controller
+from app.api.controllers.home_controller import app as home_controller
 from app.api.controllers.locations_controller import \
     app as locations_controller
 from app.api.controllers.members_controller import app as members_controller
@@ -16,7 +17,16 @@ from app.api.controllers.roles_controller import app as role_controller
 from app.api.controllers.store_controller import app as store_controller
 from app.api.controllers.teams_controller import app as teams_controller
 from app.api.controllers.users_controller import app as user_controller
-from app.api.dependencies.cleaner import scheduled_cleaner
+from app.api.cruds import news as news_crud
+from app.api.dependencies.cleaner import (flush_news_views,
+                                          schedule_all_news_publications,
+                                          scheduled_cleaner)
+from app.api.dependencies.database import SessionLocal
+from app.api.dependencies.feeds import refresh_news_feeds
+from app.api.dependencies.live import live_broker
+from app.api.dependencies.news_index import news_index
+from app.api.dependencies.suggestions import title_suggestions
+from app.config import settings
 
 
 @asynccontextmanager
@@ -31,9 +41,55 @@ async def lifespan(app: FastAPI):
         logger.info("Cleaner is running")
     except Exception as err:
         logger.error(err)
+    
+    try:
+        await schedule_all_news_publications()
+        logger.info("News publications are scheduled")
+    except Exception as err:
+        logger.error(err)
+    
+    await refresh_news_feeds()
+    
+    try:
+        async with SessionLocal() as db:
+            rows = await news_crud.get_news_titles(db)
+        title_suggestions.build(rows)
+        logger.info(
+            f"News title suggestions are built in "
+            f"{title_suggestions.build_time:.2f}s"
+        )
+    except Exception as err:
+        logger.error(err)
+    
+    if settings.NEWS_SEARCH_INDEX:
+        try:
+            async with SessionLocal() as db:
+                rows = await news_crud.get_news_for_index(db)
+            news_index.build(rows)
+            logger.info(f"News search index is built: {news_index.stats()}")
+        except Exception as err:
+            logger.error(err)
         
+    if settings.EVENTS_LIVE_BRIDGE:
+        try:
+            await live_broker.start_bridge()
+            logger.info("Live events bridge is listening")
+        except Exception as err:
+            logger.error(err)
+    
     yield
     
+    try:
+        await live_broker.stop_bridge()
+    except Exception as err:
+        logger.error(err)
+    
+    try:
+        await flush_news_views()
+        logger.info("News views are flushed")
+    except Exception as err:
+        logger.error(err)
+    
     try:
         scheduled_cleaner.shutdown()
         logger.info("Cleaner is stopped")
@@ -65,4 +121,5 @@ app.include_router(members_controller, prefix="/api/v1/teams/kokoc/members", tag
 app.include_router(events_controller, prefix="/api/v1/events", tags=["Events"])
 app.include_router(locations_controller, prefix="/api/v1/locations", tags=["Locations"])
 app.include_router(store_controller, prefix="/api/v1/store", tags=["Store"])
+app.include_router(home_controller, prefix="/api/v1/home", tags=["Home"])
 app.include_router(health_controller, prefix="/api/v1/health", tags=["Health check"])
\ No newline at end of file
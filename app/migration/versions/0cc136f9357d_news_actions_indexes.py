@@ -0,0 +1,28 @@
+"""News actions indexes
+
+Revision ID: 0cc136f9357d
+Revises: ff80e0a3d2d6
+Create Date: 2026-10-18 12:48:13.330571
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0cc136f9357d'
+down_revision: Union[str, None] = 'ff80e0a3d2d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_news_actions_type_created_at', 'news_actions', ['type', 'created_at'], unique=False)
+    op.create_index('ix_news_actions_news_id', 'news_actions', ['news_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_actions_news_id', table_name='news_actions')
+    op.drop_index('ix_news_actions_type_created_at', table_name='news_actions')
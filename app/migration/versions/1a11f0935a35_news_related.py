@@ -0,0 +1,37 @@
+"""News related
+
+Revision ID: 1a11f0935a35
+Revises: 0cc136f9357d
+Create Date: 2026-10-18 14:21:37.604119
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a11f0935a35'
+down_revision: Union[str, None] = '0cc136f9357d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('news_related',
+    sa.Column('news_id', sa.Integer(), nullable=False),
+    sa.Column('related_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['news_id'], ['news.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['related_id'], ['news.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('news_id', 'related_id')
+    )
+    op.create_index('ix_news_related_news_id_score', 'news_related', ['news_id', sa.text('score DESC')], unique=False)
+    op.create_index('ix_news_related_related_id', 'news_related', ['related_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_related_related_id', table_name='news_related')
+    op.drop_index('ix_news_related_news_id_score', table_name='news_related')
+    op.drop_table('news_related')
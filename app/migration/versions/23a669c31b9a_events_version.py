@@ -0,0 +1,26 @@
+"""Events version
+
+Revision ID: 23a669c31b9a
+Revises: a7fa24a58bc9
+Create Date: 2026-10-18 16:10:52.907316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '23a669c31b9a'
+down_revision: Union[str, None] = 'a7fa24a58bc9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('events', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('events', 'version')
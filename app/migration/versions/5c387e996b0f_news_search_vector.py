@@ -0,0 +1,40 @@
+"""News search vector
+
+Revision ID: 5c387e996b0f
+Revises: d44b8bc2a1a4
+Create Date: 2026-10-18 10:47:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c387e996b0f'
+down_revision: Union[str, None] = 'd44b8bc2a1a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news', sa.Column(
+        'search_vector', postgresql.TSVECTOR(), 
+        sa.Computed(
+            "setweight(to_tsvector('russian', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('russian', coalesce(content, '')), 'B')",
+            persisted=True
+        ), 
+        nullable=False
+    ))
+    op.create_index(
+        'ix_news_search_vector', 'news', ['search_vector'], unique=False, 
+        postgresql_using='gin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_search_vector', table_name='news')
+    op.drop_column('news', 'search_vector')
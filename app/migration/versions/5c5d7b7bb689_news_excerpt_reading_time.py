@@ -0,0 +1,53 @@
+"""News excerpt and reading time
+
+Revision ID: 5c5d7b7bb689
+Revises: 5c387e996b0f
+Create Date: 2026-10-18 11:31:52.640195
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c5d7b7bb689'
+down_revision: Union[str, None] = '5c387e996b0f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news', sa.Column('excerpt', sa.String(length=512), server_default='', nullable=False))
+    op.add_column('news', sa.Column('reading_time', sa.Integer(), server_default='1', nullable=False))
+    # Backfill existing news the same way the application computes
+    # excerpts (plain text, 280 characters, cut on a word boundary without
+    # trailing punctuation, see make_excerpt) and reading time (200 words/min)
+    op.execute(
+        """
+        WITH plain AS (
+            SELECT id, 
+                   trim(regexp_replace(regexp_replace(content, '<[^>]+>', ' ', 'g'), '\\s+', ' ', 'g')) AS text
+            FROM news
+        )
+        UPDATE news
+        SET excerpt = CASE 
+                WHEN length(plain.text) <= 280 THEN plain.text
+                ELSE rtrim(
+                    regexp_replace(left(plain.text, 279), ' [^ ]*$', ''), 
+                    ',.;:-—'
+                ) || '…'
+            END,
+            reading_time = greatest(
+                1, ceil(coalesce(array_length(regexp_split_to_array(plain.text, ' '), 1), 0) / 200.0)
+            )
+        FROM plain
+        WHERE news.id = plain.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('news', 'reading_time')
+    op.drop_column('news', 'excerpt')
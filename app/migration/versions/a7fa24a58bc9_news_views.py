@@ -0,0 +1,36 @@
+"""News views
+
+Revision ID: a7fa24a58bc9
+Revises: 1a11f0935a35
+Create Date: 2026-10-18 15:02:11.481920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7fa24a58bc9'
+down_revision: Union[str, None] = '1a11f0935a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('news', sa.Column('views', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('news_views',
+    sa.Column('news_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('views', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['news_id'], ['news.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('news_id', 'day')
+    )
+    op.create_index('ix_news_views_day', 'news_views', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_views_day', table_name='news_views')
+    op.drop_table('news_views')
+    op.drop_column('news', 'views')
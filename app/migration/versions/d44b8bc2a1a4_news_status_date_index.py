@@ -0,0 +1,29 @@
+"""News status and date index
+
+Revision ID: d44b8bc2a1a4
+Revises: 73c3bf8f6edf
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd44b8bc2a1a4'
+down_revision: Union[str, None] = '73c3bf8f6edf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_news_status_news_date_id', 'news', 
+        ['status', sa.text('news_date DESC'), 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_news_status_news_date_id', table_name='news')
@@ -0,0 +1,34 @@
+"""Events indexes
+
+Revision ID: e726a202c396
+Revises: 23a669c31b9a
+Create Date: 2026-10-18 16:42:08.155063
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e726a202c396'
+down_revision: Union[str, None] = '23a669c31b9a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_events_start_date', 'events', ['start_date'], unique=False)
+    op.create_index('ix_events_end_date', 'events', ['end_date'], unique=False)
+    op.create_index('ix_events_current_start_date', 'events', ['start_date'], unique=False, postgresql_where=sa.text('end_date IS NULL'))
+    op.create_index('ix_events_first_team_id', 'events', ['first_team_id'], unique=False)
+    op.create_index('ix_events_second_team_id', 'events', ['second_team_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_second_team_id', table_name='events')
+    op.drop_index('ix_events_first_team_id', table_name='events')
+    op.drop_index('ix_events_current_start_date', table_name='events', postgresql_where=sa.text('end_date IS NULL'))
+    op.drop_index('ix_events_end_date', table_name='events')
+    op.drop_index('ix_events_start_date', table_name='events')
@@ -0,0 +1,29 @@
+"""News scheduled status
+
+Revision ID: ff80e0a3d2d6
+Revises: 5c5d7b7bb689
+Create Date: 2026-10-18 12:05:27.913604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ff80e0a3d2d6'
+down_revision: Union[str, None] = '5c5d7b7bb689'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "UPDATE news SET status = 'scheduled' "
+        "WHERE status = 'available' AND news_date > now()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("UPDATE news SET status = 'available' WHERE status = 'scheduled'")
@@ -0,0 +1,131 @@
+"""
+Compare the year/month filters of the events list on a seeded dataset.
+
+Seeds several seasons of events into a scratch database, times 
+crud.get_all_events, which filters start_date by a date range, against 
+the same query filtered by extract(), and rolls everything back.
+
+The database is never taken from the app settings, it is given by 
+BENCH_DATABASE_URL (postgresql+asyncpg://...) and must be migrated 
+to the head revision.
+
+Usage: BENCH_DATABASE_URL=... python -m scripts.bench_events_filters 
+       [--seasons 10] [--events 5000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+from sqlalchemy import extract, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.cruds import event as crud
+from app.api.models import Event
+from app.config import get_db_url
+
+FIRST_SEASON = 2015
+PAGE_SIZE = 20
+
+
+async def seed(db, seasons: int, events: int) -> None:
+    teams = await db.execute(text(
+        "INSERT INTO teams (name, logo_url) "
+        "VALUES ('Bench home', ''), ('Bench away', '') RETURNING id"
+    ))
+    first_team_id, second_team_id = teams.scalars().all()
+    
+    # Events spread evenly over every season, an hour long each
+    await db.execute(
+        text(
+            "INSERT INTO events (league, start_date, end_date, "
+            "first_team_id, second_team_id) "
+            "SELECT 'Bench', start_date, start_date + interval '1 hour', "
+            ":first_team_id, :second_team_id "
+            "FROM (SELECT make_timestamp(CAST(:first_season AS int), 1, 1, "
+            "0, 0, 0) + i * interval '1 year' * CAST(:seasons AS int) "
+            "/ CAST(:total AS int) AS start_date "
+            "FROM generate_series(0, CAST(:total AS int) - 1) AS i) AS dates"
+        ),
+        {
+            "first_team_id": first_team_id, "second_team_id": second_team_id,
+            "first_season": FIRST_SEASON, "seasons": seasons,
+            "total": seasons * events
+        }
+    )
+    await db.execute(text("ANALYZE events"))
+
+
+async def get_events_by_extract(db, year: int, month: int | None):
+    query = (
+        crud.select_event_rows()
+        .where(extract("year", Event.start_date) == year)
+        .order_by(Event.start_date).offset(0).limit(PAGE_SIZE)
+    )
+    if month:
+        query = query.where(extract("month", Event.start_date) == month)
+    
+    results = await db.execute(query)
+    return results.all()
+
+
+async def get_events_by_range(db, year: int, month: int | None):
+    return await crud.get_all_events(
+        db, limit=PAGE_SIZE, offset=0, opponent_id=None, year=year, 
+        month=month
+    )
+
+
+async def measure(db, get_events, year: int, month: int | None, 
+                  repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started_at = time.perf_counter()
+        await get_events(db, year, month)
+        timings.append(time.perf_counter() - started_at)
+    return statistics.median(timings) * 1000
+
+
+async def main(database_url: str, seasons: int, events: int, 
+               repeats: int) -> None:
+    engine = create_async_engine(database_url)
+    async with async_sessionmaker(bind=engine)() as db:
+        try:
+            await seed(db, seasons=seasons, events=events)
+            print(f"Seeded {seasons * events} events over {seasons} seasons")
+            
+            year = FIRST_SEASON + seasons // 2
+            for month in (None, 6):
+                period = f"{year}" if month is None else f"{year}-{month:02}"
+                for name, get_events in (
+                    ("extract", get_events_by_extract),
+                    ("range", get_events_by_range),
+                ):
+                    median = await measure(
+                        db, get_events, year, month, repeats
+                    )
+                    print(f"{period:<8} {name:<8} {median:8.2f} ms")
+        finally:
+            # Nothing of the dataset is kept
+            await db.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--events", type=int, default=5000, 
+                        help="events per season")
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+    
+    database_url = os.environ.get("BENCH_DATABASE_URL")
+    if not database_url:
+        sys.exit("BENCH_DATABASE_URL of a scratch database is not set")
+    if database_url == get_db_url():
+        sys.exit("BENCH_DATABASE_URL is the database of the app, "
+                 "use a scratch one")
+    
+    asyncio.run(main(database_url, args.seasons, args.events, args.repeats))
@@ -0,0 +1,20 @@
+import os
+
+ENV_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".env")
+
+# The app settings are read on import, tests that don't touch the database 
+# run without a .env
+TEST_SETTINGS = {
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_NAME": "kokoc",
+    "DB_USER": "kokoc",
+    "DB_PASSWORD": "kokoc",
+    "ACCESS_SECRET_KEY": "test",
+    "REFRESH_SECRET_KEY": "test",
+    "IMAGES_PATH": "images",
+}
+
+if not os.path.exists(ENV_FILE):
+    for name, value in TEST_SETTINGS.items():
+        os.environ.setdefault(name, value)
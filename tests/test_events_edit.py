@@ -0,0 +1,100 @@
+"""
+Full edit of an event (PUT /events) without a database, the session only
+records the commit.
+"""
+import asyncio
+import json
+from datetime import datetime
+
+from app.api import models
+from app.api.controllers import events_controller
+from app.api.cruds import event as crud
+from app.api.schemas.event import EditEvent
+from app.api.services import events_service
+from app.api.schemas.user import User
+from app.config import transactions
+
+
+class FakeSession:
+
+    def __init__(self):
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    async def refresh(self, instance):
+        pass
+
+
+def make_event() -> models.Event:
+    return models.Event(
+        id=1, league="Медиалига", tour="1 тур", 
+        start_date=datetime(2024, 5, 1, 18), end_date=datetime(2024, 5, 1, 20), 
+        location_id=None, location=None, first_team_id=1, second_team_id=2,
+        first_team=models.Team(id=1, name="Кокос", logo_url="kokoc.png"),
+        second_team=models.Team(id=2, name="Динамо", logo_url="dynamo.png"),
+        first_team_score=0, second_team_score=0, stream_url=None, version=1
+    )
+
+
+def make_edit() -> EditEvent:
+    return EditEvent(
+        id=1, league="Медиалига", tour="1 тур", 
+        start_date=datetime(2024, 5, 1, 18), end_date=None, 
+        first_team_id=1, second_team_id=2, first_team_score=2, 
+        second_team_score=1, stream_url="https://vk.com/video1"
+    )
+
+
+def use_event(monkeypatch, event_obj: models.Event) -> None:
+    async def get_event_by_id(db, event_id):
+        return event_obj
+
+    monkeypatch.setattr(crud, "get_event_by_id", get_event_by_id)
+
+
+def test_edit_event_without_end_date(monkeypatch):
+    use_event(monkeypatch, make_event())
+    user = User.model_construct(permissions=[transactions.EDIT_EVENT])
+    edit = make_edit()
+    db = FakeSession()
+
+    event = asyncio.run(
+        events_controller.edit_event(event=edit, current_user=user, db=db)
+    )
+
+    assert db.commits == 1
+    assert event.end_date is None
+    assert event.stream_url == "https://vk.com/video1"
+    assert event.first_team.score == 2
+
+
+def test_edit_event_reaches_live_subscribers(monkeypatch):
+    use_event(monkeypatch, make_event())
+    user = User.model_construct(permissions=[transactions.EDIT_EVENT])
+
+    async def edit_event():
+        # The stream of the SSE and WebSocket endpoints
+        updates = await events_service.get_event_live_updates(
+            FakeSession(), event_id=1
+        )
+        try:
+            current = await anext(updates)
+            await events_controller.edit_event(
+                event=make_edit(), current_user=user, db=FakeSession()
+            )
+            return current, await anext(updates)
+        finally:
+            await updates.aclose()
+
+    current, update = asyncio.run(edit_event())
+
+    assert json.loads(current)["end_date"] == "2024-05-01T20:00:00"
+    assert json.loads(update) == {
+        "id": 1, "first_team_score": 2, "second_team_score": 1,
+        "start_date": "2024-05-01T18:00:00", "end_date": None,
+    }
@@ -0,0 +1,118 @@
+"""
+Query plans of the news listings on a seeded table.
+
+Needs a Postgres database migrated to the head revision, its URL is taken
+from TEST_DATABASE_URL (postgresql+asyncpg://...), the tests are skipped
+without it. The seeded news are rolled back.
+"""
+import asyncio
+import os
+from datetime import datetime
+
+import pytest
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+if not TEST_DATABASE_URL:
+    pytest.skip("TEST_DATABASE_URL is not set", allow_module_level=True)
+
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.api.cruds import news as crud
+
+LISTING_INDEX = "ix_news_status_news_date_id"
+SEEDED_NEWS = 20000
+SEEDED_CATEGORY = "plans_test"
+
+
+class EmptyResult:
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class RecordingSession:
+    """
+    Stands in for AsyncSession, keeps the statement built by a crud
+    function instead of running it.
+    """
+
+    def __init__(self):
+        self.query = None
+
+    async def execute(self, query):
+        self.query = query
+        return EmptyResult()
+
+
+async def get_statement(get_news, **params) -> str:
+    db = RecordingSession()
+    await get_news(db, **params)
+    assert db.query is not None, "the query failed, see the log"
+
+    return str(db.query.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+
+async def seed(connection) -> None:
+    await connection.execute(
+        text("INSERT INTO news_categories (name) VALUES (:name)"),
+        {"name": SEEDED_CATEGORY}
+    )
+    # Ten years of news, mostly available, every tenth one deleted
+    # and every twentieth one scheduled
+    await connection.execute(
+        text(
+            "INSERT INTO news (title, news_date, content, category_name, "
+            "image_url, status) "
+            "SELECT 'Новость ' || i, "
+            "timestamp '2015-01-01' + i * interval '1 day' * 3650 / :total, "
+            "'Текст новости ' || i, :category, '', "
+            "CASE WHEN i % 10 = 0 THEN 'unavailable' "
+            "WHEN i % 20 = 5 THEN 'scheduled' ELSE 'available' END "
+            "FROM generate_series(1, CAST(:total AS int)) AS i"
+        ),
+        {"total": SEEDED_NEWS, "category": SEEDED_CATEGORY}
+    )
+    await connection.execute(text("ANALYZE news"))
+
+
+async def explain(statement: str) -> str:
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as connection:
+            await seed(connection)
+            results = await connection.execute(text(f"EXPLAIN {statement}"))
+            plan = "\n".join(results.scalars().all())
+            await connection.rollback()
+    finally:
+        await engine.dispose()
+
+    return plan
+
+
+@pytest.mark.parametrize("get_news, params", [
+    (crud.get_all_news, {"year": None, "month": None, "category": None}),
+    (crud.get_all_news, {"year": 2020, "month": 5, "category": None}),
+    (crud.get_all_news, {
+        "year": None, "month": None, "category": None,
+        "cursor": (datetime(2020, 5, 1), 10)
+    }),
+    (crud.get_all_deleted_news, {}),
+    (crud.get_all_deleted_news, {"year": 2020, "month": None}),
+    (crud.get_all_scheduled_news, {"year": None, "month": None}),
+])
+def test_listing_uses_status_date_index(get_news, params):
+    statement = asyncio.run(
+        get_statement(get_news, limit=10, offset=0, **params)
+    )
+    plan = asyncio.run(explain(statement))
+
+    assert LISTING_INDEX in plan, plan
+    # The index already returns the news_date DESC, id ordering
+    assert "Sort" not in plan, plan